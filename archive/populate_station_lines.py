@@ -3,25 +3,37 @@ Populate station_lines.json using only local static data.
 Uses coordinate_mapping.json and previously downloaded GTFS data.
 """
 
+import argparse
 import json
 import os
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False  # Falls back to stdlib json
+
 # File paths
 COORD_MAPPING_PATH = "coordinate_mapping.json"
 STATION_LINES_PATH = "station_lines.json"
 
 def load_json(filepath):
-    """Load JSON file"""
+    """Load JSON file (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(Path(filepath).read_bytes())
     with open(filepath, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 def save_json(filepath, data):
-    """Save JSON file with nice formatting"""
+    """Save JSON file with nice formatting (same 2-space layout with or without orjson)"""
+    if ORJSON_AVAILABLE:
+        Path(filepath).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
-def main():
+def main(rename=False):
     print("🚇 Populating station_lines.json from LOCAL DATA ONLY")
     print("=" * 70)
     
@@ -49,10 +61,9 @@ def main():
     
     # Check which MTA stations from coordinate_mapping are missing from station_lines
     print("\n📊 Checking coverage...")
-    missing_stations = []
-    for gtfs_id in mta_coords.keys():
-        if gtfs_id not in mta_stations:
-            missing_stations.append(gtfs_id)
+    mta_coord_keys = set(mta_coords)
+    mta_station_keys = set(mta_stations)
+    missing_stations = sorted(mta_coord_keys - mta_station_keys)
     
     if missing_stations:
         print(f"\n⚠️  Found {len(missing_stations)} missing MTA stations:")
@@ -66,10 +77,7 @@ def main():
     
     # Check for extra stations in station_lines that aren't in coordinate_mapping
     print("\n📊 Checking for extra stations in station_lines...")
-    extra_stations = []
-    for gtfs_id in mta_stations.keys():
-        if gtfs_id not in mta_coords:
-            extra_stations.append(gtfs_id)
+    extra_stations = sorted(mta_station_keys - mta_coord_keys)
     
     if extra_stations:
         print(f"\n✓ Found {len(extra_stations)} stations in station_lines not in coordinate_mapping:")
@@ -108,16 +116,19 @@ def main():
         print(f"\n⚠️  {len(missing_stations)} stations need to be added from GTFS data.")
         print("   Run build_from_mta_gtfs.py to add them.")
     
-    # Optionally rename mta_major_stations to mta_all_stations
-    print("\n💡 Optional: Rename 'mta_major_stations' to 'mta_all_stations'?")
-    response = input("   Type 'yes' to rename, or press Enter to skip: ").strip().lower()
-    
-    if response == 'yes':
+    # Optionally rename mta_major_stations to mta_all_stations (--rename, no prompt)
+    if not rename:
+        print("\n💡 Optional: pass --rename to rename 'mta_major_stations' to 'mta_all_stations'")
+    elif "mta_major_stations" in station_lines:
         station_lines["mta_all_stations"] = station_lines.pop("mta_major_stations")
         save_json(STATION_LINES_PATH, station_lines)
-        print("   ✓ Renamed to 'mta_all_stations' and saved!")
+        print("\n   ✓ Renamed to 'mta_all_stations' and saved!")
     else:
-        print("   Skipped renaming.")
+        print("\n   No 'mta_major_stations' section to rename.")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Check station_lines.json coverage against coordinate_mapping.json")
+    parser.add_argument("--rename", action="store_true",
+                        help="rename the 'mta_major_stations' section to 'mta_all_stations' and save")
+    args = parser.parse_args()
+    main(rename=args.rename)
@@ -4,19 +4,35 @@ Real-time arrival board for MTA Subway and PATH trains
 """
 from fastapi import FastAPI, HTTPException, Form, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, FileResponse, HTMLResponse, RedirectResponse, StreamingResponse
+from fastapi.responses import JSONResponse, FileResponse, HTMLResponse, ORJSONResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from starlette.datastructures import Headers, MutableHeaders
 
 from dotenv import load_dotenv
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 import httpx
 import json
 import re
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 import os
 import asyncio
+import struct
+import zlib
+from dataclasses import dataclass
+from contextlib import asynccontextmanager
+import functools
+import gzip
+import hashlib
+import heapq
+import hmac
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+from operator import itemgetter
 
 try:
     from PIL import Image, ImageDraw, ImageFont
@@ -39,35 +55,191 @@ except ImportError:
     PLAYWRIGHT_AVAILABLE = False
     print("Warning: playwright library not installed. Screenshot rendering unavailable.")
 
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False  # Falls back to HTTP/1.1 keep-alive
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False  # Falls back to stdlib json (slower parsing only)
+
+# Debug diagnostics for the arrivals pipeline (silent unless DEBUG logging is enabled)
+logger = logging.getLogger(__name__)
+
 # Load environment variables
 load_dotenv()
 
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Environment settings, read and validated once at import (after .env is loaded)."""
+    here_api_key: str
+    admin_passcode: str
+    openweather_api_key: str | None
+    root_path: str
+
+
+def hash_password(password: str) -> bytes:
+    """SHA-256 digest of a password (fixed length, so digests compare in constant time)."""
+    return hashlib.sha256(password.encode('utf-8')).digest()
+
+
+def load_config() -> Config:
+    """Build CONFIG from the environment. Raises ValueError if a required key is missing."""
+    here_api_key = os.getenv("HERE_API_KEY")
+    if not here_api_key:
+        raise ValueError(
+            "HERE_API_KEY environment variable is required. "
+            "Create a .env file with HERE_API_KEY=your_key or set it as an environment variable."
+        )
+    admin_passcode = os.getenv("ADMIN_PASSCODE")
+    if not admin_passcode:
+        raise ValueError(
+            "ADMIN_PASSCODE environment variable is required. "
+            "Set it in your .env file for admin access."
+        )
+    openweather_api_key = os.getenv("OPENWEATHER_API_KEY")
+    if not openweather_api_key:
+        print("Warning: OPENWEATHER_API_KEY not set. Weather data will not be updated automatically.")
+    
+    return Config(
+        here_api_key=here_api_key,
+        admin_passcode=admin_passcode,
+        openweather_api_key=openweather_api_key,
+        # Dynamic root_path for deployment flexibility
+        root_path=os.getenv("ROOT_PATH", "/einktrain")
+    )
+
+
+# Configuration
+CONFIG = load_config()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """App lifespan: startup_event() before the first request, shutdown_event() after the last."""
+    await startup_event()
+    try:
+        yield
+    finally:
+        await shutdown_event()
+
+
 # Initialize FastAPI with dynamic root_path for deployment flexibility
-ROOT_PATH = os.getenv("ROOT_PATH", "/einktrain")
 app = FastAPI(
     title="HERE Transit Display - Multi-Tenant",
-    root_path=ROOT_PATH
+    root_path=CONFIG.root_path,
+    lifespan=lifespan,
+    # Dict results from the API routes are serialized by orjson when it's installed
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
 )
 
-# Initialize Jinja2 templates
-templates = Jinja2Templates(directory="templates")
 
-# Configuration
-HERE_API_KEY = os.getenv("HERE_API_KEY")
-if not HERE_API_KEY:
-    raise ValueError(
-        "HERE_API_KEY environment variable is required. "
-        "Create a .env file with HERE_API_KEY=your_key or set it as an environment variable."
-    )
-ADMIN_PASSCODE = os.getenv("ADMIN_PASSCODE")
-if not ADMIN_PASSCODE:
-    raise ValueError(
-        "ADMIN_PASSCODE environment variable is required. "
-        "Set it in your .env file for admin access."
-    )
-OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
-if not OPENWEATHER_API_KEY:
-    print("Warning: OPENWEATHER_API_KEY not set. Weather data will not be updated automatically.")
+# Content types that must reach the client untouched: PNG/WebP frames are already
+# compressed, and gzip would hold back NDJSON lines until its buffer fills
+UNCOMPRESSED_CONTENT_TYPES = ("image/", "application/x-ndjson")
+
+
+class SelectiveGZipMiddleware:
+    """
+    Gzip JSON/HTML/CSS responses (arrival boards repeat the same keys for every train,
+    so they shrink several-fold for clients polling over slow links), skipping images,
+    streams and responses that are already encoded.
+    Plain ASGI wrapper: the content type is checked on http.response.start, so it
+    doesn't depend on Starlette's GZipMiddleware internals.
+    """
+    
+    def __init__(self, app, minimum_size: int = 500, compresslevel: int = 9):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or "gzip" not in Headers(scope=scope).get("Accept-Encoding", ""):
+            await self.app(scope, receive, send)
+            return
+        
+        start_message = None  # Held back until the first body chunk decides the encoding
+        passthrough = False
+        compressor = None  # Set once a multi-chunk body is being compressed
+        
+        async def send_selective(message):
+            nonlocal start_message, passthrough, compressor
+            if passthrough:
+                await send(message)
+                return
+            
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (headers.get("content-type", "").startswith(UNCOMPRESSED_CONTENT_TYPES)
+                        or "content-encoding" in headers):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+            
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            
+            if compressor is not None:
+                data = compressor.compress(body)
+                if not more_body:
+                    data += compressor.flush()
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+            
+            if not more_body and len(body) < self.minimum_size:
+                # Small single-chunk body: not worth the gzip framing
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+            
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["Content-Encoding"] = "gzip"
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body:
+                body = gzip.compress(body, compresslevel=self.compresslevel, mtime=0)
+                headers["Content-Length"] = str(len(body))
+                passthrough = True
+                await send(start_message)
+                await send({"type": "http.response.body", "body": body})
+                return
+            
+            # Streaming body of unknown length: compress chunk by chunk
+            del headers["Content-Length"]
+            compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressor.compress(body), "more_body": True})
+        
+        await self.app(scope, receive, send_selective)
+
+
+# Level 5 keeps per-response CPU low; bodies under 500 bytes aren't worth the framing
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=500, compresslevel=5)
+
+# Initialize Jinja2 templates
+# Compiled template bytecode is cached on disk, so each worker loads it instead of
+# lexing/parsing/compiling on cold start. Jinja's default location is a per-user
+# 0700 directory it checks the owner of (cache files are executed when loaded).
+# Set TEMPLATE_AUTO_RELOAD = True while editing templates (otherwise changes need a
+# server restart).
+TEMPLATE_AUTO_RELOAD = False
+templates = Jinja2Templates(env=Environment(
+    loader=FileSystemLoader("templates"),
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=TEMPLATE_AUTO_RELOAD,
+    cache_size=400,
+    autoescape=True
+))
 
 DEPARTURES_URL = "https://transit.hereapi.com/v8/departures"
 WEATHER_URL = "https://api.openweathermap.org/data/3.0/onecall"
@@ -78,30 +250,89 @@ NYC_LON = -74.0060
 # Maximum number of arrivals to display
 MAX_ARRIVALS = 13
 
+# Sort keys (C-level itemgetters: no Python lambda call per comparison)
+BY_MIN = itemgetter('min')
+BY_MIN_LINE = itemgetter('min', 'line')
+BY_NAME = itemgetter('name')
+
 # Timezone Configuration - US Eastern Time (automatically handles DST)
 EASTERN_TZ = ZoneInfo("America/New_York")
 
+# Formatted display clock, recomputed once per wall-clock minute: [epoch_minute, "02:15 PM"]
+CURRENT_TIME_CACHE = [None, '']
+
+
+def current_time_str() -> str:
+    """Current Eastern time as 'HH:MM AM/PM' (tz conversion + strftime only when the minute changes)."""
+    epoch_minute = int(time.time() // 60)
+    if CURRENT_TIME_CACHE[0] != epoch_minute:
+        CURRENT_TIME_CACHE[:] = [epoch_minute, datetime.now(EASTERN_TZ).strftime('%I:%M %p')]
+    return CURRENT_TIME_CACHE[1]
+
 # Global font cache (loaded once at startup for better Pi performance)
 FONT_CACHE = {
     'xlarge': None, 'large': None, 'medium': None,
     'small': None, 'xsmall': None, 'tiny': None
 }
 
-# Left column image cache (weather + note section for Pi performance)
-LEFT_COL_CACHE = {
+# Left column tile caches (Pi performance): the weather tile changes hourly,
+# the note tile only when the config is saved, so they are cached independently
+WEATHER_TILE_CACHE = {
     'data_hash': None,
     'image': None
 }
-
-# User config cache (reduces SD card reads on Pi)
+NOTE_TILE_CACHE = {
+    'note': None,
+    'image': None
+}
+# Frames are drawn in worker threads; the tile caches above are shared, so drawing is serialized
+DRAW_LOCK = threading.Lock()
+
+# Transformed HERE departures per HERE station (all upcoming trains, unfiltered),
+# shared by every display, complex and API request that hits the same station
+TRANSFORMED_CACHE_TTL = 15  # seconds
+TRANSFORMED_CACHE = {}  # here_id -> (fetched_at, arrivals)
+TRANSFORMED_CACHE_LOCKS = {}  # here_id -> asyncio.Lock (one upstream fetch per station on a miss)
+
+# Filtered arrivals cache shared by display_page and /render_alt
+# One entry per distinct (station, time window, selected lines) display config
+ARRIVALS_CACHE_TTL = 15  # seconds
+ARRIVALS_CACHE = {}  # key -> (fetched_at, arrivals, station_name)
+
+# Rendered image cache for /render_alt (skips drawing + PNG encoding on repeat polls)
+RENDER_CACHE_TTL = 20  # seconds
+RENDER_CACHE_MAX_ENTRIES = 32
+RENDER_CACHE = {}  # content hash -> (rendered_at, png_bytes, etag)
+LAST_RENDER = {}  # display_id -> (fingerprint, etag, png_bytes)
+
+# Last Playwright capture per display for /render, keyed by the page HTML it was taken
+# from: an unchanged page (same arrivals, weather and clock minute) reuses the image
+SCREENSHOT_CACHE = {}  # display_id -> (html_digest, image_bytes, media_type, etag)
+SCREENSHOT_CACHE_LOCKS = {}  # display_id -> asyncio.Lock (one capture per display at a time)
+
+# User config cache (reduces SD card reads on Pi); reloaded when the file's mtime changes,
+# updated in place by save_user_config. 'version' bumps on every change (render fingerprint).
 USER_CONFIG_CACHE = {}
-USER_CONFIG_CACHE_TIME = {}
+USER_CONFIG_CACHE_TIME = {'file_mtime': None, 'version': 0}
+# Serializes read-modify-write of user_configs.json (config saves run in worker threads)
+USER_CONFIGS_WRITE_LOCK = threading.Lock()
+
+# MTA GTFS-RT feed cache (feeds refresh every ~30s, so reuse parsed feeds briefly)
+MTA_FEED_CACHE_TTL = 15  # seconds
+MTA_FEED_CACHE = {}  # route -> (fetched_at, feed)
+MTA_FEED_CACHE_LOCK = threading.Lock()
+
+# Shared worker pool for fetching MTA route feeds in parallel
+MTA_FEED_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mta-feed")
 
 # Enable Playwright-based screenshot rendering (resource intensive)
-# Set to True if you need /render/{display_id} endpoint for HTML rendering
-# Set to False to use only /render_alt/{display_id} (Pillow-based rendering)
+# Set to True if you need /render/{display_id} to screenshot the HTML page
+# Set to False to serve Pillow-drawn frames on /render too (same as /render_alt/{display_id})
 ENABLE_PLAYWRIGHT_RENDERING = False
 
+# Warm browser pages kept open for /render (concurrent captures beyond this wait for a free page)
+BROWSER_POOL_SIZE = 2
+
 # Enable HTML display pages at /{display_id}
 # Set to True if you need web-based HTML preview pages
 # Set to False to use only /render_alt/{display_id} (direct image endpoint for e-ink)
@@ -110,6 +341,9 @@ ENABLE_HTML_PAGES = False
 # User configurations file
 USER_CONFIGS_FILE = Path(__file__).parent / "user_configs.json"
 
+# Last fetched weather (shared by all users), persisted across restarts
+WEATHER_FILE = Path(__file__).parent / "weather.json"
+
 # Load GTFS to HERE mapping
 MAPPING_FILE = Path(__file__).parent / "gtfs_to_here_map.json"
 COORDINATE_MAPPING_FILE = Path(__file__).parent / "coordinate_mapping.json"
@@ -118,6 +352,8 @@ STATION_MAPPING = {}
 STATION_NAMES = {}  # Maps GTFS ID to station name
 STATION_AGENCY = {}  # Maps GTFS ID to agency (MTA or PATH)
 STATION_LINES_METADATA = {}  # Maps station ID to available lines
+STATION_INFO = {}  # Maps GTFS ID to (here_id, station name, agency) - one lookup per display request
+COMPLEX_MEMBERS = {}  # Maps complex ID to ((sub GTFS ID, here_id), ...) for its mapped stations
 
 # Manual overrides for 3 stations that failed discovery (100% coverage)
 MANUAL_OVERRIDES = {
@@ -198,14 +434,56 @@ STATION_COMPLEXES = {
     },
 }
 
+# Station dropdown ordering: complexes first, then PATH, then everything else (MTA)
+AGENCY_SORT_RANK = {'COMPLEX': 0, 'PATH': 1}
+
+# All GTFS IDs that belong to a complex (static, so computed once at import)
+COMPLEX_GTFS_IDS = frozenset(
+    gtfs_id for complex_info in STATION_COMPLEXES.values() for gtfs_id in complex_info['gtfs_ids']
+)
+
+
+def load_json_file(path: Path):
+    """Parse a JSON file (orjson when installed - several times faster than stdlib json)."""
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def parse_json(data: bytes):
+    """Parse a JSON document from bytes (orjson when installed)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_json(obj, indent: bool = False) -> bytes:
+    """
+    Serialize obj to UTF-8 JSON bytes (orjson when installed), compact unless indent
+    is set (2 spaces, for files meant to be hand-edited).
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
 
 def load_station_mapping():
-    """Load GTFS to HERE mapping with manual overrides and station names."""
-    global STATION_MAPPING, STATION_NAMES, STATION_AGENCY, STATION_AGENCY
+    """
+    Load GTFS to HERE mapping with manual overrides and station names.
+    Every station map is built fresh and then assigned to its global.
+    """
+    global STATION_MAPPING, STATION_NAMES, STATION_AGENCY, STATION_LINES_METADATA, STATION_INFO, COMPLEX_MEMBERS
+    
+    station_names = {}
+    station_agency = {}
+    station_lines_metadata = {}
     
     if MAPPING_FILE.exists():
-        with open(MAPPING_FILE, 'r', encoding='utf-8') as f:
-            STATION_MAPPING = json.load(f)
+        STATION_MAPPING = load_json_file(MAPPING_FILE)
     else:
         STATION_MAPPING = {}
     
@@ -214,39 +492,63 @@ def load_station_mapping():
     
     # Load station names from coordinate mapping
     if COORDINATE_MAPPING_FILE.exists():
-        with open(COORDINATE_MAPPING_FILE, 'r', encoding='utf-8') as f:
-            coord_data = json.load(f)
-            
-            # Load MTA station names
-            if 'mta' in coord_data:
-                for gtfs_id, station_info in coord_data['mta'].items():
-                    if 'stop_name' in station_info:
-                        STATION_NAMES[gtfs_id] = station_info['stop_name']
-                    STATION_AGENCY[gtfs_id] = 'MTA'
-            
-            # Load PATH station names (use station_name for PATH)
-            if 'path' in coord_data:
-                for gtfs_id, station_info in coord_data['path'].items():
-                    if 'station_name' in station_info:
-                        STATION_NAMES[gtfs_id] = station_info['station_name']
-                    STATION_AGENCY[gtfs_id] = 'PATH'
+        coord_data = load_json_file(COORDINATE_MAPPING_FILE)
+        
+        # Load MTA station names (built with comprehensions, merged in C with |=)
+        if 'mta' in coord_data:
+            mta_stations = coord_data['mta']
+            station_names |= {
+                gtfs_id: station_info['stop_name']
+                for gtfs_id, station_info in mta_stations.items()
+                if 'stop_name' in station_info
+            }
+            station_agency |= dict.fromkeys(mta_stations, 'MTA')
+        
+        # Load PATH station names (use station_name for PATH)
+        if 'path' in coord_data:
+            path_stations = coord_data['path']
+            station_names |= {
+                gtfs_id: station_info['station_name']
+                for gtfs_id, station_info in path_stations.items()
+                if 'station_name' in station_info
+            }
+            station_agency |= dict.fromkeys(path_stations, 'PATH')
     
     # Load station lines metadata
     if STATION_LINES_FILE.exists():
-        with open(STATION_LINES_FILE, 'r', encoding='utf-8') as f:
-            lines_data = json.load(f)
-            # Flatten all station types into one dictionary
-            for category in ['path_stations', 'complexes', 'mta_all_stations']:
-                if category in lines_data:
-                    STATION_LINES_METADATA.update(lines_data[category])
-            print(f"✓ Loaded line metadata for {len(STATION_LINES_METADATA)} stations")
+        lines_data = load_json_file(STATION_LINES_FILE)
+        # Flatten all station types into one dictionary
+        for category in ['path_stations', 'complexes', 'mta_all_stations']:
+            if category in lines_data:
+                station_lines_metadata.update(lines_data[category])
+        print(f"✓ Loaded line metadata for {len(station_lines_metadata)} stations")
     else:
         print("⚠ station_lines.json not found, will fetch lines dynamically")
     
     # Add manual override names
-    STATION_NAMES['723'] = 'Grand Central-42 St'
-    STATION_NAMES['901'] = 'Grand Central-42 St'
-    STATION_NAMES['Newark Penn Station'] = 'Newark Penn Station'
+    station_names['723'] = 'Grand Central-42 St'
+    station_names['901'] = 'Grand Central-42 St'
+    station_names['Newark Penn Station'] = 'Newark Penn Station'
+    
+    STATION_NAMES = station_names
+    STATION_AGENCY = station_agency
+    STATION_LINES_METADATA = station_lines_metadata
+    
+    # Merge the per-station maps (name defaults to the GTFS ID, agency to MTA)
+    STATION_INFO = {
+        gtfs_id: (here_id, STATION_NAMES.get(gtfs_id, gtfs_id), STATION_AGENCY.get(gtfs_id, 'MTA'))
+        for gtfs_id, here_id in STATION_MAPPING.items()
+    }
+    
+    # Resolve complex members once (skipping unmapped stations) so requests don't re-walk them
+    COMPLEX_MEMBERS = {
+        complex_id: tuple(
+            (sub_gtfs_id, STATION_MAPPING[sub_gtfs_id])
+            for sub_gtfs_id in complex_info['gtfs_ids']
+            if sub_gtfs_id in STATION_MAPPING
+        )
+        for complex_id, complex_info in STATION_COMPLEXES.items()
+    }
     
     print(f"✓ Loaded {len(STATION_MAPPING)} station mappings")
     print(f"✓ Manual overrides: {list(MANUAL_OVERRIDES.keys())}")
@@ -291,6 +593,12 @@ def load_fonts_at_startup():
             FONT_CACHE[key] = default_font
 
 
+@functools.lru_cache(maxsize=256)
+def get_text_width(text: str, font_key: str) -> int:
+    """Pixel width of text in a cached font (memoized; getlength skips full bbox layout)."""
+    return round(FONT_CACHE[font_key].getlength(text))
+
+
 # ============================================================
 # MTA Line Colors (Official MTA Standards)
 # ============================================================
@@ -325,56 +633,155 @@ MTA_LINE_COLORS = {
 # Screenshot Service - Persistent Browser Manager
 # ============================================================
 class BrowserManager:
-    """Manages a single persistent headless browser instance for screenshots."""
+    """
+    Manages a single persistent headless browser for screenshots, with a small pool
+    of warm pages (one browser context each) so concurrent captures don't share a page.
+    """
     
-    def __init__(self):
+    def __init__(self, pool_size: int = BROWSER_POOL_SIZE):
         self.playwright = None
         self.browser = None
-        self.page = None
+        self.pool_size = pool_size
+        self.contexts = []
+        self.page_pool = None  # asyncio.Queue of idle pages
+    
+    @property
+    def ready(self) -> bool:
+        return bool(self.contexts)
     
     async def start(self):
-        """Initialize the browser instance."""
+        """Launch the browser once and open the page pool."""
         if not PLAYWRIGHT_AVAILABLE:
             print("Warning: Playwright not available. Screenshot rendering disabled.")
             return
         
         try:
             self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(headless=True)
-            self.page = await self.browser.new_page(viewport={'width': 800, 'height': 480})
-            print("✓ Browser manager initialized")
+            self.browser = await self.playwright.chromium.launch(headless=True, args=['--disable-gpu'])
+            self.page_pool = asyncio.Queue()
+            for _ in range(self.pool_size):
+                context = await self.browser.new_context(viewport={'width': 800, 'height': 480})
+                page = await context.new_page()
+                # Fail fast on hung loads instead of blocking captures for 30s
+                page.set_default_timeout(3000)
+                self.contexts.append(context)
+                self.page_pool.put_nowait(page)
+            print(f"✓ Browser manager initialized ({self.pool_size} pages)")
         except Exception as e:
             print(f"Error initializing browser: {e}")
     
     async def close(self):
-        """Close the browser instance."""
-        if self.page:
-            await self.page.close()
+        """Close the page pool and the browser instance."""
+        for context in self.contexts:
+            await context.close()
+        self.contexts = []
         if self.browser:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
         print("✓ Browser manager closed")
     
-    async def capture_screenshot(self, url: str) -> bytes:
+    async def capture_screenshot(self, html: str) -> bytes:
         """
-        Navigate to URL and capture screenshot.
+        Load already-rendered page HTML into a pooled page and capture screenshot
+        (no HTTP round trip back into this server). Waits for a free page if all are busy.
         Returns PNG image bytes.
         """
-        if not self.page:
+        if not self.ready:
             raise RuntimeError("Browser not initialized")
         
-        await self.page.goto(url, wait_until='networkidle')
-        screenshot_bytes = await self.page.screenshot(type='png')
-        return screenshot_bytes
+        page = await self.page_pool.get()
+        try:
+            # Wait for DOMContentLoaded instead of 'networkidle' (saves its 500ms quiet period)
+            await page.set_content(html, wait_until='domcontentloaded')
+            
+            # Give stragglers (fonts, icons) a brief chance to finish loading
+            try:
+                await page.wait_for_load_state('load', timeout=500)
+            except Exception:
+                pass
+            
+            return await page.screenshot(type='png')
+        finally:
+            self.page_pool.put_nowait(page)
+
+
+def convert_png_to_webp(png_bytes: bytes) -> bytes:
+    """
+    Re-encode PNG screenshot bytes as WebP (roughly 2-3x smaller for UI screenshots).
+    Blocking - call via asyncio.to_thread from request handlers.
+    """
+    with Image.open(BytesIO(png_bytes)) as img:
+        webp_buffer = BytesIO()
+        img.save(webp_buffer, format='WEBP', quality=85, method=4)
+    return webp_buffer.getvalue()
+
+
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """Build one PNG chunk: length, type, data, CRC32 over type+data."""
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_IEND = _png_chunk(b'IEND', b'')
+
+
+def encode_1bit_png(img: Image.Image) -> bytes:
+    """
+    Encode a mode '1' image as a 1-bit grayscale PNG.
+    Pillow already packs mode '1' rows MSB-first (1 = white), which is exactly PNG's
+    bit-depth-1 layout, so we only prepend the 'None' filter byte to each row and
+    deflate at level 1 - no per-row filter selection pass.
+    """
+    width, height = img.size
+    raw = img.tobytes()
+    stride = (width + 7) // 8
+    scanlines = b''.join(
+        b'\x00' + raw[offset:offset + stride]
+        for offset in range(0, stride * height, stride)
+    )
+    ihdr = struct.pack('>IIBBBBB', width, height, 1, 0, 0, 0, 0)  # 1-bit grayscale
+    return (PNG_SIGNATURE
+            + _png_chunk(b'IHDR', ihdr)
+            + _png_chunk(b'IDAT', zlib.compress(scanlines, 1))
+            + PNG_IEND)
 
 
 # Initialize browser manager
 browser_manager = BrowserManager()
 
+# Shared HTTP client (connection pool + keep-alive across HERE and OpenWeather requests)
+http_client = None
+
+# Cap on concurrent HERE departures requests (complex fan-out x many displays)
+HERE_MAX_CONCURRENT_REQUESTS = 16
+HERE_REQUEST_SEMAPHORE = asyncio.Semaphore(HERE_MAX_CONCURRENT_REQUESTS)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use if startup has not run."""
+    global http_client
+    if http_client is None or http_client.is_closed:
+        # HTTP/2 multiplexes the complex fan-out over one TLS connection (when h2 is installed);
+        # connect retries keep a transient failure on one station from failing the whole board
+        http_client = httpx.AsyncClient(
+            timeout=30.0,
+            transport=httpx.AsyncHTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                retries=2,
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=50, keepalive_expiry=30.0)
+            )
+        )
+    return http_client
+
 # Weather update task
 weather_task = None
 
+# Most recent weather from the background refresher (seeded from WEATHER_FILE at startup);
+# handlers read it from memory and fall back to a user's legacy config copy if unset
+LATEST_WEATHER = None
+WEATHER_VERSION = 0  # Bumped whenever LATEST_WEATHER changes (part of the render fingerprint)
+
 
 # Icon mapping for OpenWeather conditions/icon codes to Lucide icons
 ICON_MAP = {
@@ -418,109 +825,148 @@ ICON_MAP = {
 
 async def fetch_nyc_weather():
     """Fetch current weather data for NYC from OpenWeatherMap One Call API 3.0."""
-    if not OPENWEATHER_API_KEY:
+    if not CONFIG.openweather_api_key:
         return None
     
     try:
         params = {
             'lat': NYC_LAT,
             'lon': NYC_LON,
-            'appid': OPENWEATHER_API_KEY,
+            'appid': CONFIG.openweather_api_key,
             'units': 'metric'  # Get temperature in Celsius
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(WEATHER_URL, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract weather information from One Call API 3.0 response
-            current = data['current']
-            daily = data['daily'][0]  # Today's forecast for high/low
-            
-            # Get icon code and map to Lucide icon
-            icon_code = current['weather'][0].get('icon', '')
-            condition = current['weather'][0]['main']
-            lucide_icon = ICON_MAP.get(icon_code, ICON_MAP.get(condition, 'cloud'))
-            
-            weather_data = {
-                'temp_c': str(round(current['temp'])),
-                'temp_f': str(round(current['temp'] * 9/5 + 32)),
-                'condition': condition,
-                'icon': lucide_icon,
-                'high_c': str(round(daily['temp']['max'])),
-                'low_c': str(round(daily['temp']['min']))
-            }
-            
-            print(f"Weather updated: {weather_data['temp_c']}°C / {weather_data['temp_f']}°F - {weather_data['condition']}")
-            return weather_data
-            
+        # Shared pooled client (keep-alive with the HERE requests)
+        client = get_http_client()
+        response = await client.get(WEATHER_URL, params=params, timeout=10.0)
+        response.raise_for_status()
+        data = parse_json(response.content)
+        
+        # Extract weather information from One Call API 3.0 response
+        current = data['current']
+        daily = data['daily'][0]  # Today's forecast for high/low
+        
+        # Get icon code and map to Lucide icon
+        icon_code = current['weather'][0].get('icon', '')
+        condition = current['weather'][0]['main']
+        lucide_icon = ICON_MAP.get(icon_code, ICON_MAP.get(condition, 'cloud'))
+        
+        weather_data = {
+            'temp_c': str(round(current['temp'])),
+            'temp_f': str(round(current['temp'] * 9/5 + 32)),
+            'condition': condition,
+            'icon': lucide_icon,
+            'high_c': str(round(daily['temp']['max'])),
+            'low_c': str(round(daily['temp']['min']))
+        }
+        
+        print(f"Weather updated: {weather_data['temp_c']}°C / {weather_data['temp_f']}°F - {weather_data['condition']}")
+        return weather_data
+        
     except Exception as e:
         print(f"Error fetching weather: {e}")
         return None
 
 
+def write_weather_file(weather_data: dict):
+    """Atomically replace the persisted weather (temp file + rename). Blocking file I/O."""
+    tmp_file = WEATHER_FILE.with_suffix('.json.tmp')
+    with open(tmp_file, 'wb') as f:
+        f.write(dump_json(weather_data))  # machine-read only, so compact
+    os.replace(tmp_file, WEATHER_FILE)
+
+
+def load_weather_file():
+    """Weather persisted by the last update, or None if there is none (or it's unreadable)."""
+    try:
+        return load_json_file(WEATHER_FILE)
+    except (OSError, ValueError):
+        return None
+
+
 async def update_all_user_weather():
-    """Update weather data for all users in config file."""
+    """
+    Update the in-memory weather and persist it to WEATHER_FILE.
+    One small file for everyone, so the hourly update never touches user_configs.json.
+    """
+    global LATEST_WEATHER, WEATHER_VERSION
+    
     weather_data = await fetch_nyc_weather()
-    if not weather_data:
+    if not weather_data or weather_data == LATEST_WEATHER:
         return
     
-    if not USER_CONFIGS_FILE.exists():
-        return
+    LATEST_WEATHER = weather_data
+    WEATHER_VERSION += 1
     
     try:
-        with open(USER_CONFIGS_FILE, 'r', encoding='utf-8') as f:
-            configs = json.load(f)
-        
-        # Update weather for all users
-        for user_id in configs:
-            configs[user_id]['weather_data'] = weather_data
-        
-        with open(USER_CONFIGS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(configs, f, indent=2, ensure_ascii=False)
-            
-        print(f"Updated weather data for {len(configs)} user(s)")
-        
+        # File write runs in a worker thread so request handling isn't blocked
+        await asyncio.to_thread(write_weather_file, weather_data)
     except Exception as e:
-        print(f"Error updating user configs with weather: {e}")
+        print(f"Error saving weather data: {e}")
+
+
+WEATHER_UPDATE_INTERVAL = 3600  # seconds
 
 
 async def weather_update_loop():
-    """Background task to update weather every hour."""
+    """
+    Background task to update weather every hour.
+    Runs on a fixed monotonic schedule, so slow fetches or errors don't push later
+    updates back; runs missed while the host was stalled/asleep are skipped, not replayed.
+    """
+    loop = asyncio.get_running_loop()
+    # startup_event has just fetched, so the first scheduled run is an interval away
+    next_run = loop.time() + WEATHER_UPDATE_INTERVAL
     while True:
+        await asyncio.sleep(max(0.0, next_run - loop.time()))
         try:
             await update_all_user_weather()
-            # Wait 1 hour before next update
-            await asyncio.sleep(3600)
         except Exception as e:
             print(f"Error in weather update loop: {e}")
-            await asyncio.sleep(60)  # Wait 1 minute on error before retrying
+        
+        next_run += WEATHER_UPDATE_INTERVAL
+        while next_run <= loop.time():
+            next_run += WEATHER_UPDATE_INTERVAL
 
 
-@app.on_event("startup")
 async def startup_event():
     """Initialize browser and start weather updates on startup."""
-    global weather_task
+    global weather_task, LATEST_WEATHER, WEATHER_VERSION
     
     # Load fonts once at startup (Pi optimization)
     if PILLOW_AVAILABLE:
         load_fonts_at_startup()
     
+    # Compile (or load cached bytecode for) all templates before serving traffic
+    template_names = templates.env.list_templates()
+    for name in template_names:
+        templates.env.get_template(name)
+    print(f"✓ Templates precompiled: {len(template_names)}")
+    
+    # Build the station lists once so the first dropdown load doesn't pay for it
+    get_all_stations()
+    build_stations_response_gzip()
+    
+    # Open the shared HTTP connection pool
+    get_http_client()
+    
+    # Serve the last persisted weather until the first update comes in
+    LATEST_WEATHER = load_weather_file()
+    WEATHER_VERSION += 1
+    
     if ENABLE_PLAYWRIGHT_RENDERING:
         await browser_manager.start()
     
     # Initial weather update
-    if OPENWEATHER_API_KEY:
+    if CONFIG.openweather_api_key:
         await update_all_user_weather()
         # Start background task for hourly updates
         weather_task = asyncio.create_task(weather_update_loop())
         print("Weather update task started (updates every hour)")
 
 
-@app.on_event("shutdown")
 async def shutdown_event():
-    """Close browser and stop weather updates on shutdown."""
+    """Close browser, HTTP client and stop weather updates on shutdown."""
     global weather_task
     if weather_task:
         weather_task.cancel()
@@ -529,25 +975,26 @@ async def shutdown_event():
         except asyncio.CancelledError:
             pass
     await browser_manager.close()
+    if http_client is not None:
+        await http_client.aclose()
 
 
 def load_user_config(display_id: str):
     """Load configuration for a specific display ID (with cache for Pi performance). Returns dict or None."""
-    global USER_CONFIG_CACHE, USER_CONFIG_CACHE_TIME
+    global USER_CONFIG_CACHE
     
-    if not USER_CONFIGS_FILE.exists():
+    try:
+        # Check if file was modified (compare mtime; one stat call, no separate exists())
+        current_mtime = USER_CONFIGS_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
         return None
     
     try:
-        # Check if file was modified (compare mtime)
-        current_mtime = USER_CONFIGS_FILE.stat().st_mtime
-        cached_mtime = USER_CONFIG_CACHE_TIME.get('file_mtime', 0)
-        
-        # Reload from disk only if file changed
-        if current_mtime != cached_mtime:
-            with open(USER_CONFIGS_FILE, 'r', encoding='utf-8') as f:
-                USER_CONFIG_CACHE = json.load(f)
-                USER_CONFIG_CACHE_TIME['file_mtime'] = current_mtime
+        # Reload from disk only if file changed (e.g. edited by hand)
+        if current_mtime != USER_CONFIG_CACHE_TIME['file_mtime']:
+            USER_CONFIG_CACHE = load_json_file(USER_CONFIGS_FILE)
+            USER_CONFIG_CACHE_TIME['file_mtime'] = current_mtime
+            USER_CONFIG_CACHE_TIME['version'] += 1
         
         return USER_CONFIG_CACHE.get(display_id)
     except Exception as e:
@@ -555,66 +1002,97 @@ def load_user_config(display_id: str):
         return None
 
 
+def write_user_configs(configs: dict):
+    """
+    Atomically replace the user configs file.
+    Writes to a temp file and renames it over the original, so readers
+    see either the old or the new file, never a partial write.
+    """
+    # Serialize up front and hand the file one buffer (json.dump issues a write per token)
+    data = dump_json(configs, indent=True)
+    tmp_file = USER_CONFIGS_FILE.with_suffix('.json.tmp')
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_file, USER_CONFIGS_FILE)
+
+
 def save_user_config(display_id: str, config: dict):
     """Save configuration for a specific display ID."""
-    global USER_CONFIG_CACHE, USER_CONFIG_CACHE_TIME
-    
-    configs = {}
-    if USER_CONFIGS_FILE.exists():
-        with open(USER_CONFIGS_FILE, 'r', encoding='utf-8') as f:
-            configs = json.load(f)
+    global USER_CONFIG_CACHE
     
-    configs[display_id] = config
-    
-    with open(USER_CONFIGS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(configs, f, indent=2)
+    # Read-modify-write under the lock: saves run in worker threads
+    with USER_CONFIGS_WRITE_LOCK:
+        configs = {}
+        if USER_CONFIGS_FILE.exists():
+            configs = load_json_file(USER_CONFIGS_FILE)
+        
+        configs[display_id] = config
+        
+        write_user_configs(configs)
+        
+        # Write-through: the cache already matches what was just written, so the next
+        # load_user_config doesn't re-parse the file
+        USER_CONFIG_CACHE = configs
+        USER_CONFIG_CACHE_TIME['file_mtime'] = USER_CONFIGS_FILE.stat().st_mtime_ns
+        USER_CONFIG_CACHE_TIME['version'] += 1
+
+
+def sort_stations(stations: list) -> list:
+    """
+    Sort stations: complexes first, then PATH, then MTA, all alphabetically.
+    Stations are bucketed by agency rank up front so each bucket can be sorted
+    with a C-level itemgetter key instead of a Python sort_key function.
+    """
+    buckets = ([], [], [])
+    rank_get = AGENCY_SORT_RANK.get
+    for station in stations:
+        buckets[rank_get(station['agency'], 2)].append(station)
     
-    # Invalidate cache after save
-    USER_CONFIG_CACHE_TIME['file_mtime'] = 0
+    sorted_stations = []
+    for bucket in buckets:
+        bucket.sort(key=BY_NAME)
+        sorted_stations.extend(bucket)
+    return sorted_stations
 
 
+@functools.lru_cache(maxsize=1)
 def get_all_stations() -> list:
-    """Get all stations for dropdown (includes complexes, PATH, and MTA)."""
-    stations = []
-    complex_gtfs_ids = set()
+    """
+    Get all stations for dropdown (includes complexes, PATH, and MTA).
+    Station data is static after load_station_mapping(), so the list is built once
+    and shared between requests - treat it as read-only.
+    """
+    # Bind globals/methods to locals once (avoids global lookups inside the loops)
+    names_get = STATION_NAMES.get
+    agency_get = STATION_AGENCY.get
+    complex_gtfs_ids = COMPLEX_GTFS_IDS
     
     # Add station complexes first
-    for complex_id, info in STATION_COMPLEXES.items():
-        stations.append({
+    stations = [
+        {
             'id': complex_id,
             'name': info['name'],
             'agency': 'COMPLEX',
             'here_id': 'complex'
-        })
-        complex_gtfs_ids.update(info['gtfs_ids'])
+        }
+        for complex_id, info in STATION_COMPLEXES.items()
+    ]
     
-    # Add regular stations (skip those in complexes)
-    for gtfs_id, here_id in STATION_MAPPING.items():
-        if gtfs_id not in complex_gtfs_ids:
-            # Get proper station name
-            station_name = STATION_NAMES.get(gtfs_id, gtfs_id)
-            
-            # Get agency from STATION_AGENCY dict (default to MTA if not found)
-            agency = STATION_AGENCY.get(gtfs_id, 'MTA')
-            
-            stations.append({
-                'id': gtfs_id,
-                'name': station_name,
-                'agency': agency,
-                'here_id': here_id
-            })
+    # Add regular stations (skip those in complexes), streamed straight into the list.
+    # Name defaults to the GTFS ID and agency to MTA if not found.
+    stations.extend(
+        {
+            'id': gtfs_id,
+            'name': names_get(gtfs_id, gtfs_id),
+            'agency': agency_get(gtfs_id, 'MTA'),
+            'here_id': here_id
+        }
+        for gtfs_id, here_id in STATION_MAPPING.items()
+        if gtfs_id not in complex_gtfs_ids
+    )
     
     # Sort: Complexes first, then PATH, then MTA, all alphabetically
-    def sort_key(s):
-        if s['agency'] == 'COMPLEX':
-            return (0, s['name'])
-        elif s['agency'] == 'PATH':
-            return (1, s['name'])
-        else:
-            return (2, s['name'])
-    
-    stations.sort(key=sort_key)
-    return stations
+    return sort_stations(stations)
 
 
 async def fetch_departures(here_station_id: str) -> dict:
@@ -624,56 +1102,103 @@ async def fetch_departures(here_station_id: str) -> dict:
     """
     params = {
         'ids': here_station_id,
-        'apiKey': HERE_API_KEY,
+        'apiKey': CONFIG.here_api_key,
         'maxPerBoard': 40,  # Max departures per platform/board (default is 5)
         'maxBoards': 10,    # Max platforms/boards to return
         'lang': 'en-US'
     }
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    # Reuse pooled connections instead of a new TCP+TLS handshake per call;
+    # the semaphore keeps concurrent fan-out from swamping the HERE API
+    client = get_http_client()
+    async with HERE_REQUEST_SEMAPHORE:
         response = await client.get(DEPARTURES_URL, params=params)
-        response.raise_for_status()
-        return response.json()
+    response.raise_for_status()
+    return parse_json(response.content)
 
 
-def parse_iso_time(iso_string: str) -> int:
+def parse_iso_time(iso_string: str, now_utc: datetime = None) -> int:
     """
     Parse ISO 8601 datetime and return minutes from now.
     Example: "2026-01-22T14:30:00-05:00" -> 5 (if current time is 14:25)
+    Pass now_utc (datetime.now(timezone.utc)) to reuse one clock reading across a whole board.
     """
     try:
         departure_time = datetime.fromisoformat(iso_string)
-        now = datetime.now(departure_time.tzinfo)
-        delta = departure_time - now
-        minutes = int(delta.total_seconds() / 60)
+        if departure_time.tzinfo is None:
+            now = datetime.now()  # Naive (local) time - can't subtract an aware now
+        else:
+            now = now_utc or datetime.now(timezone.utc)
+        minutes = int((departure_time - now).total_seconds() / 60)
         return max(0, minutes)  # Never negative
     except Exception:
         return 0
 
 
-def get_mta_arrivals(gtfs_id: str) -> list:
+def get_mta_feed(route: str):
+    """
+    Get the parsed GTFS-RT feed for a route, reusing a recent fetch if available.
+    Returns None if the feed could not be fetched.
+    """
+    now = time.monotonic()
+    with MTA_FEED_CACHE_LOCK:
+        cached = MTA_FEED_CACHE.get(route)
+    if cached and now - cached[0] < MTA_FEED_CACHE_TTL:
+        return cached[1]
+    
+    try:
+        feed = SubwayFeed.get(route)
+    except Exception:
+        # Route might not exist or have errors, skip it silently
+        return None
+    
+    with MTA_FEED_CACHE_LOCK:
+        MTA_FEED_CACHE[route] = (time.monotonic(), feed)
+    return feed
+
+
+def get_mta_arrivals(gtfs_id: str, min_minutes: int = 0, max_minutes: int = None, lines: frozenset = None) -> list:
     """
     Get real-time MTA subway arrivals using underground library.
+    Only trains min_minutes..max_minutes away (no upper bound if None) on the given
+    normalized lines (all lines if empty/None) become arrival dicts; routes outside
+    lines aren't fetched at all.
     Returns: [{"line": "F", "dest": "Coney Island", "min": 3}, ...]
     """
     if not MTA_FEED_AVAILABLE:
         return []
+    if max_minutes is None:
+        max_minutes = float('inf')
     
     try:
         # Pi Optimization: Query only routes that serve this station (reduces API calls by ~70%)
         if gtfs_id in STATION_LINES_METADATA:
             routes = STATION_LINES_METADATA[gtfs_id]
-            # print(f"Optimized: Querying {len(routes)} routes for station {gtfs_id}: {routes}")
+            logger.debug("Optimized: Querying %d routes for station %s: %s", len(routes), gtfs_id, routes)
         else:
             # Fallback: Query all major routes if metadata not available
             routes = ['A', 'C', 'E', 'B', 'D', 'F', 'M', 'G', 'L', 'J', 'Z',
                       'N', 'Q', 'R', 'W', '1', '2', '3', '4', '5', '6', '7', 'S']
         
+        # Line filter pushdown: skip feeds for routes the display doesn't show
+        if lines:
+            routes = [route for route in routes if route.strip().upper() in lines]
+        
         arrivals = []
         
-        for route in routes:
+        # Fetch all route feeds in parallel on the shared pool (cached for a few seconds)
+        feeds = MTA_FEED_EXECUTOR.map(get_mta_feed, routes)
+        
+        # Loop invariants: our station's base ID and "now" (as a POSIX timestamp, which
+        # compares directly against aware, naive-local and numeric train times)
+        target_base = gtfs_id.rstrip('NS')
+        now_ts = time.time()
+        
+        for route, feed in zip(routes, feeds):
+            if feed is None:
+                continue
+            line = route
             try:
-                feed = SubwayFeed.get(route)
                 for train in feed:
                     # The stop_id in GTFS has N/S suffix for direction, our IDs don't
                     # Match if either the exact ID matches or the base ID matches
@@ -681,15 +1206,8 @@ def get_mta_arrivals(gtfs_id: str) -> list:
                     if not train_stop_id:
                         continue
                     
-                    # Remove direction suffix (N/S) if present
-                    base_stop_id = train_stop_id.rstrip('NS')
-                    target_base = gtfs_id.rstrip('NS')
-                    
-                    # Check if this train stops at our station
-                    if train_stop_id == gtfs_id or base_stop_id == target_base:
-                        # Extract route/line
-                        line = route
-                        
+                    # Check if this train stops at our station (ignoring the N/S suffix)
+                    if train_stop_id == gtfs_id or train_stop_id.rstrip('NS') == target_base:
                         # Extract destination
                         dest = getattr(train, 'headsign', None) or getattr(train, 'direction', 'Unknown')
                         
@@ -698,20 +1216,16 @@ def get_mta_arrivals(gtfs_id: str) -> list:
                             time_obj = train.time
                             try:
                                 if isinstance(time_obj, datetime):
-                                    now = datetime.now(time_obj.tzinfo if time_obj.tzinfo else None)
-                                    delta = time_obj - now
-                                    minutes = int(delta.total_seconds() / 60)
+                                    arrival_ts = time_obj.timestamp()
                                 elif isinstance(time_obj, (int, float)):
                                     # Assume it's a timestamp
-                                    from datetime import timezone
-                                    now = datetime.now(timezone.utc)
-                                    arrival_time = datetime.fromtimestamp(time_obj, tz=timezone.utc)
-                                    delta = arrival_time - now
-                                    minutes = int(delta.total_seconds() / 60)
+                                    arrival_ts = time_obj
                                 else:
                                     continue
+                                minutes = int((arrival_ts - now_ts) / 60)
                                 
-                                if minutes >= 0:  # Only include future arrivals
+                                # Only include future arrivals inside the window
+                                if minutes >= 0 and min_minutes <= minutes <= max_minutes:
                                     arrivals.append({
                                         'line': line,
                                         'dest': dest,
@@ -720,7 +1234,7 @@ def get_mta_arrivals(gtfs_id: str) -> list:
                             except Exception:
                                 continue
             except Exception as e:
-                # Route might not exist or have errors, skip it silently
+                # Malformed feed data, skip this route silently
                 pass
         
         return arrivals
@@ -729,71 +1243,81 @@ def get_mta_arrivals(gtfs_id: str) -> list:
         return []
 
 
+# Short route token (e.g. "A", "4", "GS") in a headsign, compiled once at import
+HEADSIGN_LINE_RE = re.compile(r'\b([A-Z0-9]{1,3})\b')
+
+# PATH route name mapping (HERE API longName -> our abbreviated format)
+PATH_ROUTE_MAP = {
+    "Hoboken - 33rd Street": "HOB-33",
+    "Journal Square - 33rd Street": "JSQ-33",
+    "Newark - World Trade Center": "NWK-WTC",
+    "Journal Square - World Trade Center": "JSQ-WTC",
+    "Hoboken - World Trade Center": "HOB-WTC"
+}
+
+
+def extract_transport_line(transport: dict):
+    """
+    Line name for a HERE transport entry (stripped), or None if no field yields one.
+    Tries, in order: PATH longName mapping, shortName, name, a route token in the headsign.
+    """
+    short_name = transport.get('shortName')
+    
+    # PATH-specific handling: Use longName to get the full route name
+    if short_name == 'PATH':
+        long_name = transport.get('longName')
+        if long_name:
+            # Convert full name to abbreviated format
+            return PATH_ROUTE_MAP.get(long_name.strip(), 'PATH')
+    
+    # Try shortName first (usually the route letter/number) for MTA
+    if short_name:
+        line = short_name.strip()
+        if line:
+            return line
+    
+    # Try name as fallback
+    name = transport.get('name')
+    if name:
+        name = name.strip()
+        if len(name) > 4:
+            # Try to extract route from longer name (e.g., "Subway D")
+            for word in name.split():
+                if len(word) <= 3 and word[0].isalnum():
+                    return word
+        elif name:
+            # If name is short (1-4 chars), it's probably the route
+            return name
+    
+    # Try headsign as last resort - look for single letter/number patterns
+    headsign = transport.get('headsign')
+    if headsign:
+        match = HEADSIGN_LINE_RE.search(headsign)
+        if match:
+            return match.group(1)
+    return None
+
+
 def transform_arrivals(api_response: dict) -> list:
     """
     Transform HERE API response into clean arrival list.
+    All departures are kept: the result fills the per-station TRANSFORMED_CACHE,
+    which is shared by displays with different time windows (callers window it
+    with arrivals_in_window).
     Returns: [{"line": "4", "dest": "Woodlawn", "min": 5}, ...]
     """
-    # PATH route name mapping (HERE API longName -> our abbreviated format)
-    PATH_ROUTE_MAP = {
-        "Hoboken - 33rd Street": "HOB-33",
-        "Journal Square - 33rd Street": "JSQ-33",
-        "Newark - World Trade Center": "NWK-WTC",
-        "Journal Square - World Trade Center": "JSQ-WTC",
-        "Hoboken - World Trade Center": "HOB-WTC"
-    }
-    
     arrivals = []
     
+    # Bind hot-loop lookups to locals once per call
+    append = arrivals.append
+    parse_time = parse_iso_time
+    now_utc = datetime.now(timezone.utc)  # One clock reading for the whole response
+    extract_line = extract_transport_line
+    
     boards = api_response.get('boards', [])
     for board in boards:
         departures = board.get('departures', [])
         for dep in departures:
-            transport = dep.get('transport', {})
-            
-            # Extract line name - try multiple fields aggressively
-            line = None
-            
-            # PATH-specific handling: Use longName to get the full route name
-            if transport.get('shortName') == 'PATH' and transport.get('longName'):
-                long_name = transport.get('longName').strip()
-                # Convert full name to abbreviated format
-                line = PATH_ROUTE_MAP.get(long_name, 'PATH')
-            
-            # Try shortName first (usually the route letter/number) for MTA
-            if not line and transport.get('shortName'):
-                line = transport.get('shortName').strip()
-            
-            # Try name as fallback
-            if not line and transport.get('name'):
-                name = transport.get('name').strip()
-                # If name is short (1-4 chars), it's probably the route
-                if len(name) <= 4:
-                    line = name
-                else:
-                    # Try to extract route from longer name (e.g., "Subway D")
-                    words = name.split()
-                    for word in words:
-                        if len(word) <= 3 and word[0].isalnum():
-                            line = word
-                            break
-            
-            # Try headsign as last resort
-            if not line:
-                headsign = transport.get('headsign', '')
-                if headsign:
-                    # Look for single letter/number patterns
-                    match = re.search(r'\b([A-Z0-9]{1,3})\b', headsign)
-                    if match:
-                        line = match.group(1)
-            
-            # If still no line, use placeholder instead of skipping
-            if not line:
-                line = '?'
-            
-            # Extract destination
-            destination = transport.get('headsign', 'Unknown')
-            
             # Calculate minutes until arrival
             departure_time_str = dep.get('time', '')
             if not departure_time_str:
@@ -802,19 +1326,83 @@ def transform_arrivals(api_response: dict) -> list:
                 if isinstance(time_obj, dict):
                     departure_time_str = time_obj.get('departure', '')
             
-            minutes = parse_iso_time(departure_time_str) if departure_time_str else 0
+            minutes = parse_time(departure_time_str, now_utc) if departure_time_str else 0
             
-            arrivals.append({
+            transport = dep.get('transport', {})
+            
+            # Extract line name - try multiple fields aggressively ('?' placeholder instead of skipping)
+            line = extract_line(transport) or '?'
+            
+            # Extract destination
+            destination = transport.get('headsign', 'Unknown')
+            
+            append({
                 'line': line,
                 'dest': destination,
                 'min': minutes
             })
     
     # Sort by minutes (soonest first) - don't limit here, let caller decide
-    arrivals.sort(key=lambda x: x['min'])
+    arrivals.sort(key=BY_MIN)
     return arrivals
 
 
+async def fetch_transformed(here_id: str) -> list:
+    """
+    Fetch and transform all upcoming departures for one HERE station, cached for
+    TRANSFORMED_CACHE_TTL seconds; concurrent misses for the same station share a
+    single HERE request. The returned list is shared - filter it into a new list
+    (see arrivals_in_window) rather than mutating it.
+    """
+    cached = TRANSFORMED_CACHE.get(here_id)
+    if cached and time.monotonic() - cached[0] < TRANSFORMED_CACHE_TTL:
+        return cached[1]
+    
+    # Coalesce concurrent misses: the first caller fetches, the rest wait and reuse it
+    lock = TRANSFORMED_CACHE_LOCKS.setdefault(here_id, asyncio.Lock())
+    async with lock:
+        cached = TRANSFORMED_CACHE.get(here_id)
+        if cached and time.monotonic() - cached[0] < TRANSFORMED_CACHE_TTL:
+            return cached[1]
+        
+        arrivals = transform_arrivals(await fetch_departures(here_id))
+        TRANSFORMED_CACHE[here_id] = (time.monotonic(), arrivals)
+        return arrivals
+
+
+def arrivals_in_window(arrivals: list, min_minutes: int = 0, max_minutes: int = None) -> list:
+    """New list of the arrivals within min_minutes..max_minutes (no upper bound if None)."""
+    if max_minutes is None:
+        max_minutes = float('inf')
+    return [a for a in arrivals if min_minutes <= a['min'] <= max_minutes]
+
+
+async def fetch_complex_arrivals(complex_id: str, min_minutes: int = 0, max_minutes: int = None) -> tuple:
+    """
+    Fetch and transform departures for all stations in a complex concurrently.
+    Members come from COMPLEX_MEMBERS (unmapped stations already dropped);
+    failed fetches are logged and skipped.
+    Returns (arrivals, here_ids). Arrivals are not sorted.
+    """
+    sub_stations = COMPLEX_MEMBERS[complex_id]
+    
+    # One HERE request per sub-station, all in flight at once
+    results = await asyncio.gather(
+        *(fetch_transformed(here_id) for _, here_id in sub_stations),
+        return_exceptions=True
+    )
+    
+    all_arrivals = []
+    for (sub_gtfs_id, here_id), station_arrivals in zip(sub_stations, results):
+        if isinstance(station_arrivals, Exception):
+            # Log but continue with other stations
+            print(f"Warning: Failed to fetch {sub_gtfs_id} (HERE {here_id}): {station_arrivals}")
+            continue
+        all_arrivals.extend(arrivals_in_window(station_arrivals, min_minutes, max_minutes))
+    
+    return all_arrivals, [here_id for _, here_id in sub_stations]
+
+
 @app.get("/api/arrivals/{gtfs_id}")
 async def get_arrivals(gtfs_id: str, min_minutes: int = 2, max_minutes: int = 20):
     """
@@ -834,43 +1422,19 @@ async def get_arrivals(gtfs_id: str, min_minutes: int = 2, max_minutes: int = 20
         }
     """
     # Check if this is a station complex
-    if gtfs_id in STATION_COMPLEXES:
-        complex_info = STATION_COMPLEXES[gtfs_id]
-        all_arrivals = []
-        here_ids = []
-        
-        # Query all stations in the complex
-        for sub_gtfs_id in complex_info["gtfs_ids"]:
-            here_id = STATION_MAPPING.get(sub_gtfs_id)
-            if not here_id:
-                continue  # Skip if not found
-            
-            here_ids.append(here_id)
-            
-            try:
-                # Fetch departures from HERE API
-                api_response = await fetch_departures(here_id)
-                
-                # Transform to clean format
-                arrivals = transform_arrivals(api_response)
-                all_arrivals.extend(arrivals)
-                
-            except Exception as e:
-                # Log but continue with other stations
-                print(f"Warning: Failed to fetch {sub_gtfs_id} (HERE {here_id}): {e}")
-                continue
+    complex_info = STATION_COMPLEXES.get(gtfs_id)
+    if complex_info is not None:
+        # Query all stations in the complex concurrently
+        all_arrivals, here_ids = await fetch_complex_arrivals(gtfs_id, min_minutes, max_minutes)
         
         # Sort all arrivals by time
-        all_arrivals.sort(key=lambda x: x['min'])
-        
-        # Filter by time range
-        filtered_arrivals = [a for a in all_arrivals if min_minutes <= a['min'] <= max_minutes]
+        all_arrivals.sort(key=BY_MIN)
         
         return {
             'station_id': gtfs_id,
             'station_name': complex_info['name'],
             'here_ids': here_ids,
-            'arrivals': filtered_arrivals
+            'arrivals': all_arrivals
         }
     
     # Single station (original logic)
@@ -883,19 +1447,14 @@ async def get_arrivals(gtfs_id: str, min_minutes: int = 2, max_minutes: int = 20
         )
     
     try:
-        # Fetch departures from HERE API
-        api_response = await fetch_departures(here_id)
-        
-        # Transform to clean format
-        arrivals = transform_arrivals(api_response)
-        
-        # Filter by time range
-        filtered_arrivals = [a for a in arrivals if min_minutes <= a['min'] <= max_minutes]
+        # Fetch transformed departures from HERE API (shared per-station cache)
+        # and keep only arrivals inside the time range
+        arrivals = arrivals_in_window(await fetch_transformed(here_id), min_minutes, max_minutes)
         
         return {
             'station_id': gtfs_id,
             'here_id': here_id,
-            'arrivals': filtered_arrivals
+            'arrivals': arrivals
         }
         
     except httpx.HTTPStatusError as e:
@@ -914,16 +1473,57 @@ async def get_arrivals(gtfs_id: str, min_minutes: int = 2, max_minutes: int = 20
         )
 
 
-@app.get("/api/stations")
-async def get_stations():
+@app.get("/api/arrivals/{gtfs_id}/stream")
+async def stream_arrivals(gtfs_id: str, min_minutes: int = 2, max_minutes: int = 20):
     """
-    Get list of all available stations with their GTFS IDs.
-    Includes station complexes as unified entries.
-    Used by frontend to populate the dropdown.
+    Stream arrivals as NDJSON (one arrival object per line) for a station or complex.
+    Each HERE station's rows are written as soon as that station responds instead of
+    buffering the merged board, so clients get the first rows after one RTT.
+    Rows are in arrival order per station, not globally sorted. A station whose fetch
+    fails yields one {"error": ..., "station": here_id} line instead of its arrivals.
     """
-    # Load coordinate mapping for full station details
-    coord_mapping_file = Path(__file__).parent / "coordinate_mapping.json"
+    complex_members = COMPLEX_MEMBERS.get(gtfs_id)
+    if complex_members is not None:
+        here_ids = [here_id for _, here_id in complex_members]
+    else:
+        here_id = STATION_MAPPING.get(gtfs_id)
+        if not here_id:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Station '{gtfs_id}' not found in mapping. Use GTFS Stop ID or station name."
+            )
+        here_ids = [here_id]
+    
+    async def fetch_station(here_id):
+        try:
+            return here_id, await fetch_transformed(here_id), None
+        except Exception as e:
+            return here_id, None, e
+    
+    async def ndjson_rows():
+        for next_station in asyncio.as_completed([fetch_station(here_id) for here_id in here_ids]):
+            here_id, station_arrivals, error = await next_station
+            if error is not None:
+                # Log, tell the client which station failed, and continue with other stations
+                print(f"Warning: Failed to fetch {here_id} for {gtfs_id} stream: {error}")
+                yield dump_json({'error': str(error), 'station': here_id}) + b"\n"
+                continue
+            for arrival in arrivals_in_window(station_arrivals, min_minutes, max_minutes):
+                yield dump_json(arrival) + b"\n"
     
+    return StreamingResponse(
+        ndjson_rows(),
+        media_type="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"}  # Let nginx forward each chunk immediately
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def build_stations_response() -> bytes:
+    """
+    Serialized /api/stations body. Built from the station files once (warmed at startup)
+    instead of on every request.
+    """
     stations = []
     
     # Add station complexes first
@@ -935,14 +1535,12 @@ async def get_stations():
             'here_id': 'multiple'
         })
     
-    if coord_mapping_file.exists():
-        with open(coord_mapping_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+    if COORDINATE_MAPPING_FILE.exists():
+        # Load coordinate mapping for full station details
+        data = load_json_file(COORDINATE_MAPPING_FILE)
         
         # Track which stations are already in complexes
-        complex_gtfs_ids = set()
-        for complex_info in STATION_COMPLEXES.values():
-            complex_gtfs_ids.update(complex_info['gtfs_ids'])
+        complex_gtfs_ids = COMPLEX_GTFS_IDS
         
         # Add MTA stations (excluding those in complexes)
         for gtfs_id, info in data.get('mta', {}).items():
@@ -976,22 +1574,41 @@ async def get_stations():
                 })
         
         # Sort: Complexes first, then by agency, then name
-        def sort_key(s):
-            if s['agency'] == 'COMPLEX':
-                return (0, s['name'])
-            elif s['agency'] == 'PATH':
-                return (1, s['name'])
-            else:
-                return (2, s['name'])
-        
-        stations.sort(key=sort_key)
-        
-        return {'stations': stations}
+        stations = sort_stations(stations)
     else:
         # Fallback: just return mapping keys
         stations = [{'id': k, 'name': k, 'agency': 'Unknown', 'here_id': v} 
                    for k, v in STATION_MAPPING.items()]
-        return {'stations': stations}
+    
+    return dump_json({'stations': stations})
+
+
+@functools.lru_cache(maxsize=1)
+def build_stations_response_gzip() -> bytes:
+    """build_stations_response() gzipped once at max level (mtime=0 keeps the bytes stable)."""
+    return gzip.compress(build_stations_response(), compresslevel=9, mtime=0)
+
+
+@app.get("/api/stations")
+async def get_stations(request: Request):
+    """
+    Get list of all available stations with their GTFS IDs.
+    Includes station complexes as unified entries.
+    Used by frontend to populate the dropdown.
+    """
+    # Serve the precompressed body when the client takes gzip (the middleware leaves
+    # responses that already carry a Content-Encoding alone)
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        return Response(
+            content=build_stations_response_gzip(),
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    return Response(
+        content=build_stations_response(),
+        media_type="application/json",
+        headers={"Vary": "Accept-Encoding"}
+    )
 
 
 @app.get("/api/station-lines/{gtfs_id}")
@@ -1003,8 +1620,8 @@ async def get_station_lines(gtfs_id: str):
     lines = set()
     
     # Check if it's a station complex
-    if gtfs_id in STATION_COMPLEXES:
-        complex_info = STATION_COMPLEXES[gtfs_id]
+    complex_info = STATION_COMPLEXES.get(gtfs_id)
+    if complex_info is not None:
         # Merge lines from all GTFS IDs in the complex
         for complex_gtfs_id in complex_info['gtfs_ids']:
             if complex_gtfs_id in STATION_LINES_METADATA:
@@ -1043,25 +1660,27 @@ async def _fetch_station_lines(gtfs_id: str) -> set:
     Returns a set of line identifiers.
     """
     lines = set()
-    
-    # Try to get lines from HERE API by fetching current arrivals
     here_id = STATION_MAPPING.get(gtfs_id)
-    if here_id:
-        try:
-            api_response = await fetch_departures(here_id)
-            arrivals = transform_arrivals(api_response)
-            lines.update([a['line'] for a in arrivals if a['line'] != '?'])
-        except:
-            pass
-    
-    # For MTA stations, also try to get from real-time feed
-    if STATION_AGENCY.get(gtfs_id) == 'MTA' and MTA_FEED_AVAILABLE:
-        try:
-            mta_arrivals = get_mta_arrivals(gtfs_id)
-            lines.update([a['line'] for a in mta_arrivals if a['line'] != '?'])
-        except:
-            pass
-    
+
+    async def here_arrivals():
+        # Try to get lines from HERE API by fetching current arrivals
+        if not here_id:
+            return []
+        return await fetch_transformed(here_id)
+
+    async def mta_arrivals():
+        # For MTA stations, also try to get from real-time feed (blocking, run in thread)
+        if STATION_AGENCY.get(gtfs_id) == 'MTA' and MTA_FEED_AVAILABLE:
+            return await asyncio.to_thread(get_mta_arrivals, gtfs_id)
+        return []
+
+    # Both sources are independent, so query them concurrently
+    results = await asyncio.gather(here_arrivals(), mta_arrivals(), return_exceptions=True)
+    for arrivals in results:
+        if isinstance(arrivals, Exception):
+            continue
+        lines.update(a['line'] for a in arrivals if a['line'] != '?')
+
     return lines
 
 
@@ -1101,6 +1720,20 @@ async def login_page(request: Request, redirect_to: str = None):
     })
 
 
+def login_error(request: Request, display_id: str, message: str, redirect_to: str = None) -> HTMLResponse:
+    """
+    Login page with an error message. Renders the (compiled, cached) template directly
+    instead of going through TemplateResponse, since failed logins can come in bursts.
+    """
+    return HTMLResponse(templates.get_template("login.html").render(
+        display_id=display_id,
+        message=message,
+        message_type="error",
+        redirect_to=redirect_to,
+        root_path=request.app.root_path
+    ))
+
+
 @app.post("/login")
 async def login(
     request: Request,
@@ -1115,36 +1748,17 @@ async def login(
     user_config = load_user_config(display_id)
     
     if not user_config:
-        return templates.TemplateResponse("login.html", {
-            "request": request,
-            "display_id": display_id,
-            "message": "Display ID not found. Please check your username.",
-            "message_type": "error",
-            "redirect_to": redirect_to,
-            "root_path": request.app.root_path
-        })
+        return login_error(request, display_id, "Display ID not found. Please check your username.", redirect_to)
     
-    # Verify password from environment variable
-    expected_password = os.getenv(f"{display_id.upper()}_PW")
+    # Verify password against {DISPLAY_ID}_PW, read on each login so new or rotated
+    # passwords take effect without a restart
+    expected_password = os.environ.get(f"{display_id.upper()}_PW")
     if not expected_password:
-        return templates.TemplateResponse("login.html", {
-            "request": request,
-            "display_id": display_id,
-            "message": f"Password not configured for {display_id}. Please contact administrator.",
-            "message_type": "error",
-            "redirect_to": redirect_to,
-            "root_path": request.app.root_path
-        })
+        return login_error(request, display_id, f"Password not configured for {display_id}. Please contact administrator.", redirect_to)
     
-    if password != expected_password:
-        return templates.TemplateResponse("login.html", {
-            "request": request,
-            "display_id": display_id,
-            "message": "Invalid password. Please try again.",
-            "message_type": "error",
-            "redirect_to": redirect_to,
-            "root_path": request.app.root_path
-        })
+    # Constant-time compare (a plain != leaks how much of the password matched)
+    if not hmac.compare_digest(hash_password(password), hash_password(expected_password)):
+        return login_error(request, display_id, "Invalid password. Please try again.", redirect_to)
     
     # Authentication successful - redirect to config page
     # Redirect to requested page or config page
@@ -1164,6 +1778,84 @@ async def logout(request: Request):
 
 # ===== Display Routes =====
 
+def arrivals_cache_key(config: dict) -> tuple:
+    """ARRIVALS_CACHE key for a display config: (station, time window, selected lines)."""
+    return (
+        config['gtfs_id'],
+        config.get('min_minutes', 2),
+        config.get('max_minutes', 20),
+        tuple(config.get('selected_lines', []))
+    )
+
+
+async def get_filtered_arrivals(config: dict) -> tuple:
+    """
+    Fetch, merge, filter and sort arrivals for a display config.
+    Shared by display_page and render_display_alt. Results are cached per
+    (station, time window, selected lines) for ARRIVALS_CACHE_TTL seconds.
+    Returns (arrivals, station_name). Raises HTTPException(404) for unknown stations.
+    """
+    gtfs_id = config['gtfs_id']
+    min_minutes = config.get('min_minutes', 2)
+    max_minutes = config.get('max_minutes', 20)
+    selected_lines = config.get('selected_lines', [])
+    
+    cache_key = arrivals_cache_key(config)
+    cached = ARRIVALS_CACHE.get(cache_key)
+    if cached and time.monotonic() - cached[0] < ARRIVALS_CACHE_TTL:
+        return cached[1], cached[2]
+    
+    # Line filtering is case-insensitive and whitespace-resilient
+    line_filter = frozenset(s.strip().upper() for s in selected_lines)
+    
+    complex_info = STATION_COMPLEXES.get(gtfs_id)
+    if complex_info is not None:
+        station_name = complex_info['name']
+        all_arrivals, _ = await fetch_complex_arrivals(gtfs_id, min_minutes, max_minutes)
+    
+    else:
+        # Single station
+        here_id, station_name, agency = STATION_INFO.get(gtfs_id, (None, gtfs_id, 'MTA'))
+        if not here_id:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Station mapping not found for: {gtfs_id}"
+            )
+        
+        if agency == 'MTA' and MTA_FEED_AVAILABLE:
+            # HERE data (shared per-station cache) and the MTA GTFS feeds concurrently;
+            # the feed scan is blocking, so it runs in a worker thread off the event loop
+            here_arrivals, mta_arrivals = await asyncio.gather(
+                fetch_transformed(here_id),
+                # Window and lines pushed down: trains that wouldn't be shown never become dicts
+                asyncio.to_thread(get_mta_arrivals, gtfs_id, min_minutes, max_minutes, line_filter)
+            )
+        else:
+            here_arrivals, mta_arrivals = await fetch_transformed(here_id), []
+        
+        all_arrivals = arrivals_in_window(here_arrivals, min_minutes, max_minutes)
+        logger.debug("HERE API: %d arrivals in %d-%d min", len(all_arrivals), min_minutes, max_minutes)
+        
+        # Add MTA GTFS data if this is an MTA station
+        if mta_arrivals:
+            all_arrivals.extend(mta_arrivals)
+            logger.debug("MTA GTFS: %d arrivals, combined total: %d", len(mta_arrivals), len(all_arrivals))
+    
+    
+    # Every source above is already windowed; apply the line filter lazily and keep only
+    # the soonest trains that fit on screen - no intermediate list, no full sort
+    shown = all_arrivals
+    if line_filter:
+        shown = (a for a in all_arrivals if a['line'].strip().upper() in line_filter)
+    arrivals = heapq.nsmallest(MAX_ARRIVALS, shown, key=BY_MIN_LINE)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Filter %d-%d min, lines %s: showing %d of %d arrivals",
+                     min_minutes, max_minutes, sorted(line_filter), len(arrivals), len(all_arrivals))
+    
+    ARRIVALS_CACHE[cache_key] = (time.monotonic(), arrivals, station_name)
+    return arrivals, station_name
+
+
 @app.get("/{display_id}")
 async def display_page(request: Request, display_id: str):
     """
@@ -1183,121 +1875,33 @@ async def display_page(request: Request, display_id: str):
         # No config found, redirect to config page
         return RedirectResponse(url=f"/{display_id}/config")
     
-    # Get arrivals for configured station
-    gtfs_id = config['gtfs_id']
-    min_minutes = config.get('min_minutes', 2)
-    max_minutes = config.get('max_minutes', 20)
+    try:
+        context = await display_template_context(display_id, config)
+    except HTTPException as e:
+        return {"error": e.detail}
+    except Exception as e:
+        return {"error": str(e)}
     
+    return templates.TemplateResponse("display.html", {"request": request, **context})
+
+
+async def display_template_context(display_id: str, config: dict) -> dict:
+    """
+    Template context for display.html, shared by display_page and the Playwright /render
+    path. Raises HTTPException(404) for unknown stations.
+    """
     # Parse display resolution
     display_res = config.get('display_res', '800x600')
     width, height = map(int, display_res.split('x'))
     
-    # Check if station complex
-    if gtfs_id in STATION_COMPLEXES:
-        complex_info = STATION_COMPLEXES[gtfs_id]
-        all_arrivals = []
-        
-        for sub_gtfs_id in complex_info["gtfs_ids"]:
-            here_id = STATION_MAPPING.get(sub_gtfs_id)
-            if not here_id:
-                continue
-            
-            try:
-                api_response = await fetch_departures(here_id)
-                arrivals = transform_arrivals(api_response)
-                all_arrivals.extend(arrivals)
-            except Exception as e:
-                print(f"Warning: Failed to fetch {sub_gtfs_id}: {e}")
-                continue
-        
-        # Filter and sort based on user's time window
-        filtered = [a for a in all_arrivals if min_minutes <= a['min'] <= max_minutes]
-        
-        # Apply line filtering if selected_lines is configured (case-insensitive, whitespace-resilient)
-        selected_lines = config.get('selected_lines', [])
-        if selected_lines:
-            # Normalize selected lines: strip whitespace and uppercase
-            selected_lines_upper = [s.strip().upper() for s in selected_lines]
-            # Debug: Show what we're comparing
-            # print(f"Complex Filter: Selected lines (normalized): {selected_lines_upper}")
-            
-            filtered_with_debug = []
-            for a in filtered:
-                arrival_line_normalized = a['line'].strip().upper()
-                is_match = arrival_line_normalized in selected_lines_upper
-                # print(f"  Comparing Arrival Line: '{a['line']}' (normalized: '{arrival_line_normalized}') against Filter: {selected_lines_upper} → Match: {is_match}")
-                if is_match:
-                    filtered_with_debug.append(a)
-            
-            filtered = filtered_with_debug
-            # print(f"Complex: After line filtering: {len(filtered)} arrivals")
-        
-        filtered.sort(key=lambda x: x['min'])
-        # Limit trains to fit screen
-        arrivals = filtered[:MAX_ARRIVALS]
-        station_name = complex_info['name']
-        
-    else:
-        # Single station
-        here_id = STATION_MAPPING.get(gtfs_id)
-        if not here_id:
-            return {"error": f"Station {gtfs_id} not found"}
-        
-        station_name = STATION_NAMES.get(gtfs_id, gtfs_id)
-        agency = STATION_AGENCY.get(gtfs_id, 'MTA')
-        
-        try:
-            # Get HERE API data
-            api_response = await fetch_departures(here_id)
-            here_arrivals = transform_arrivals(api_response)
-            print(f"HERE API: {len(here_arrivals)} arrivals")
-            
-            # Get MTA GTFS data if this is an MTA station
-            mta_arrivals = []
-            if agency == 'MTA' and MTA_FEED_AVAILABLE:
-                mta_arrivals = get_mta_arrivals(gtfs_id)
-                print(f"MTA GTFS: {len(mta_arrivals)} arrivals")
-            
-            # Combine and deduplicate arrivals
-            all_arrivals = here_arrivals + mta_arrivals
-            print(f"Combined total: {len(all_arrivals)} arrivals")
-            
-            # Filter and sort based on user's time window
-            filtered = [a for a in all_arrivals if min_minutes <= a['min'] <= max_minutes]
-            print(f"After filtering {min_minutes}-{max_minutes} min: {len(filtered)} arrivals")
-            
-            # Apply line filtering if selected_lines is configured (case-insensitive, whitespace-resilient)
-            selected_lines = config.get('selected_lines', [])
-            if selected_lines:
-                # Normalize selected lines: strip whitespace and uppercase
-                selected_lines_upper = [s.strip().upper() for s in selected_lines]
-                # Debug: Show what we're comparing
-                print(f"Single Station Filter: Selected lines (normalized): {selected_lines_upper}")
-                
-                filtered_with_debug = []
-                for a in filtered:
-                    arrival_line_normalized = a['line'].strip().upper()
-                    is_match = arrival_line_normalized in selected_lines_upper
-                    print(f"  Comparing Arrival Line: '{a['line']}' (normalized: '{arrival_line_normalized}') against Filter: {selected_lines_upper} → Match: {is_match}")
-                    if is_match:
-                        filtered_with_debug.append(a)
-                
-                filtered = filtered_with_debug
-                print(f"Single Station: After line filtering: {len(filtered)} arrivals")
-            
-            filtered.sort(key=lambda x: (x['min'], x['line']))
-            # Limit trains to fit screen
-            arrivals = filtered[:MAX_ARRIVALS]
-            
-        except Exception as e:
-            return {"error": str(e)}
+    # Get arrivals for configured station (shared with render_display_alt)
+    arrivals, station_name = await get_filtered_arrivals(config)
     
     # Get current time
-    from datetime import datetime
-    current_time = datetime.now(EASTERN_TZ).strftime("%I:%M %p")
+    current_time = current_time_str()
     
-    # Get weather data and custom note from config
-    weather_data = config.get('weather_data', {
+    # Get weather data (latest in memory, else from config) and custom note from config
+    weather_data = LATEST_WEATHER or config.get('weather_data', {
         'temp_c': '--',
         'temp_f': '--',
         'condition': 'N/A',
@@ -1307,8 +1911,7 @@ async def display_page(request: Request, display_id: str):
     })
     custom_note = config.get('custom_note', '')
     
-    return templates.TemplateResponse("display.html", {
-        "request": request,
+    return {
         "display_id": display_id,
         "width": width,
         "height": height,
@@ -1317,7 +1920,7 @@ async def display_page(request: Request, display_id: str):
         "arrivals": arrivals,
         "weather_data": weather_data,
         "custom_note": custom_note
-    })
+    }
 
 
 @app.get("/{display_id}/config")
@@ -1393,7 +1996,7 @@ async def save_config(
         'selected_lines': selected_lines,
         'weather_data': existing_config.get('weather_data', {'temp_c': '--', 'temp_f': '--', 'condition': 'N/A', 'icon': 'cloud', 'high_c': '--', 'low_c': '--'})
     }
-    save_user_config(display_id, config)
+    await asyncio.to_thread(save_user_config, display_id, config)
     
     # Redirect to render_alt page (Pillow-based image)
     return RedirectResponse(
@@ -1403,48 +2006,54 @@ async def save_config(
 
 
 @app.get("/render/{display_id}")
-async def render_display(display_id: str):
+async def render_display(request: Request, display_id: str):
     """
     Server-side screenshot rendering endpoint (Playwright-based HTML rendering).
-    Returns a PNG image of the display page at 800x480 resolution.
-    Note: This endpoint is disabled by default. Use /render_alt/{display_id} instead.
+    Returns a WebP image (PNG if Pillow is unavailable) of the display page at 800x480 resolution.
+    Note: Playwright is disabled by default - the display is then drawn directly with
+    Pillow, same as /render_alt/{display_id} (milliseconds, no headless Chromium).
     """
-    if not ENABLE_PLAYWRIGHT_RENDERING:
-        raise HTTPException(
-            status_code=503,
-            detail="Playwright rendering is disabled. Use /render_alt/{display_id} for Pillow-based rendering."
-        )
-    
-    if not PLAYWRIGHT_AVAILABLE:
-        raise HTTPException(
-            status_code=503,
-            detail="Screenshot service unavailable. Playwright not installed."
-        )
+    if not (ENABLE_PLAYWRIGHT_RENDERING and PLAYWRIGHT_AVAILABLE and browser_manager.ready):
+        return await render_display_alt(request, display_id)
     
-    if not browser_manager.page:
+    config = load_user_config(display_id)
+    if not config:
         raise HTTPException(
-            status_code=503,
-            detail="Browser not initialized"
+            status_code=404,
+            detail=f"No configuration found for display: {display_id}"
         )
     
     try:
-        # Construct URL to local display page
-        url = f"http://localhost:8000/{display_id}"
+        # Render the display page in-process and hand the HTML straight to the browser
+        # (no localhost request back into this server)
+        context = await display_template_context(display_id, config)
+        html = templates.get_template("display.html").render(context)
+        html_digest = hashlib.blake2b(html.encode(), digest_size=16).digest()
         
-        # Capture screenshot
-        screenshot_bytes = await browser_manager.capture_screenshot(url)
+        # Rapid polls wait for the in-flight capture and reuse it rather than queueing
+        # their own on the page pool
+        lock = SCREENSHOT_CACHE_LOCKS.setdefault(display_id, asyncio.Lock())
+        async with lock:
+            cached = SCREENSHOT_CACHE.get(display_id)
+            if cached and cached[0] == html_digest:
+                _, screenshot_bytes, media_type, etag = cached
+            else:
+                # Capture screenshot
+                screenshot_bytes = await browser_manager.capture_screenshot(html)
+                media_type = "image/png"
+                
+                # Send WebP instead of PNG when Pillow is available (less data over WiFi)
+                if PILLOW_AVAILABLE:
+                    screenshot_bytes = await asyncio.to_thread(convert_png_to_webp, screenshot_bytes)
+                    media_type = "image/webp"
+                
+                etag = f'"{html_digest.hex()}"'
+                SCREENSHOT_CACHE[display_id] = (html_digest, screenshot_bytes, media_type, etag)
         
-        # Return as streaming response
-        return StreamingResponse(
-            BytesIO(screenshot_bytes),
-            media_type="image/png",
-            headers={
-                "Cache-Control": "no-cache, no-store, must-revalidate",
-                "Pragma": "no-cache",
-                "Expires": "0"
-            }
-        )
+        return image_response(request, screenshot_bytes, etag, media_type)
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -1452,12 +2061,84 @@ async def render_display(display_id: str):
         )
 
 
+def render_fingerprint(config: dict):
+    """
+    Cheap fingerprint of everything a /render_alt frame depends on: user config cache
+    version (settings, note, persisted weather), the in-memory weather version, the fetch time of the
+    cached arrivals, and the clock minute.
+    Returns None when the arrivals cache is stale (a new fetch is needed anyway).
+    """
+    cached = ARRIVALS_CACHE.get(arrivals_cache_key(config))
+    if not cached or time.monotonic() - cached[0] >= ARRIVALS_CACHE_TTL:
+        return None
+    return (
+        USER_CONFIG_CACHE_TIME['version'],
+        WEATHER_VERSION,
+        cached[0],
+        current_time_str()
+    )
+
+
+def render_frame(station_name: str, arrivals: list, weather_data: dict, custom_note: str) -> tuple:
+    """
+    Draw and encode one /render_alt frame. Returns (png_bytes, etag).
+    Blocking (CPU-bound Pillow work) - call via asyncio.to_thread from request handlers.
+    """
+    with DRAW_LOCK:
+        img = draw_transit_display(
+            station_name=station_name,
+            arrivals=arrivals,
+            weather_data=weather_data,
+            custom_note=custom_note
+        )
+    
+    # E-ink panel is black/white only: send a 1-bit PNG (~3-5x smaller than RGB).
+    # Plain threshold rather than dithering keeps text edges clean.
+    img = img.convert('1', dither=Image.Dither.NONE)
+    
+    # Encode directly (skips PIL's PNG filter heuristics - faster on Pi)
+    png_bytes = encode_1bit_png(img)
+    etag = f'"{hashlib.blake2b(png_bytes, digest_size=8).hexdigest()}"'
+    return png_bytes, etag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    True if an If-None-Match header value matches etag: "*" or any entry of the
+    comma-separated list, compared weakly (a W/ prefix is ignored).
+    """
+    if not if_none_match:
+        return False
+    etag = etag.removeprefix('W/')
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.removeprefix('W/') == etag:
+            return True
+    return False
+
+
+def image_response(request: Request, image_bytes: bytes, etag: str, media_type: str = "image/png") -> Response:
+    """
+    Return the rendered image, or an empty 304 if the client already has this frame
+    (If-None-Match matches the ETag). Polling displays skip the download entirely.
+    The image is already in memory, so it goes out as one body with a Content-Length.
+    """
+    # no-cache (not no-store): clients keep the frame but revalidate it on every poll
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache"
+    }
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=image_bytes, media_type=media_type, headers=headers)
+
+
 @app.get("/render_alt/{display_id}")
-async def render_display_alt(display_id: str):
+async def render_display_alt(request: Request, display_id: str):
     """
     Alternative Pillow-based rendering endpoint.
     Generates a PNG image directly using PIL without HTML/browser rendering.
-    Returns an 800x480 PNG image.
+    Returns an 800x480 1-bit PNG image.
     """
     if not PILLOW_AVAILABLE:
         raise HTTPException(
@@ -1473,115 +2154,57 @@ async def render_display_alt(display_id: str):
             detail=f"No configuration found for display: {display_id}"
         )
     
-    # Get arrivals using same logic as display_page
-    gtfs_id = config['gtfs_id']
-    min_minutes = config.get('min_minutes', 2)
-    max_minutes = config.get('max_minutes', 20)
-    selected_lines = config.get('selected_lines', [])
+    # Nothing changed since this display's last frame: serve it without fetching or hashing
+    fingerprint = render_fingerprint(config)
+    last = LAST_RENDER.get(display_id)
+    if fingerprint is not None and last and last[0] == fingerprint:
+        return image_response(request, last[2], last[1])
     
-    # Fetch arrivals (same logic as display_page)
-    if gtfs_id in STATION_COMPLEXES:
-        complex_info = STATION_COMPLEXES[gtfs_id]
-        all_arrivals = []
-        
-        for sub_gtfs_id in complex_info["gtfs_ids"]:
-            here_id = STATION_MAPPING.get(sub_gtfs_id)
-            if not here_id:
-                continue
-            
-            try:
-                api_response = await fetch_departures(here_id)
-                arrivals = transform_arrivals(api_response)
-                all_arrivals.extend(arrivals)
-            except Exception as e:
-                print(f"Warning: Failed to fetch {sub_gtfs_id}: {e}")
-                continue
-        
-        # Filter by time window
-        filtered = [a for a in all_arrivals if min_minutes <= a['min'] <= max_minutes]
-        
-        # Apply line filtering
-        if selected_lines:
-            selected_lines_upper = [s.strip().upper() for s in selected_lines]
-            filtered = [a for a in filtered if a['line'].strip().upper() in selected_lines_upper]
-        
-        filtered.sort(key=lambda x: x['min'])
-        arrivals = filtered[:MAX_ARRIVALS]
-        station_name = complex_info['name']
-        
-    else:
-        # Single station
-        here_id = STATION_MAPPING.get(gtfs_id)
-        if not here_id:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Station mapping not found for: {gtfs_id}"
-            )
-        
-        station_name = STATION_NAMES.get(gtfs_id, gtfs_id)
-        agency = STATION_AGENCY.get(gtfs_id, 'MTA')
-        
-        try:
-            # Get HERE API data
-            api_response = await fetch_departures(here_id)
-            here_arrivals = transform_arrivals(api_response)
-            
-            # Get MTA GTFS data if this is an MTA station
-            mta_arrivals = []
-            if agency == 'MTA' and MTA_FEED_AVAILABLE:
-                mta_arrivals = get_mta_arrivals(gtfs_id)
-            
-            # Combine arrivals
-            all_arrivals = here_arrivals + mta_arrivals
-            
-            # Filter by time window
-            filtered = [a for a in all_arrivals if min_minutes <= a['min'] <= max_minutes]
-            
-            # Apply line filtering
-            if selected_lines:
-                selected_lines_upper = [s.strip().upper() for s in selected_lines]
-                filtered = [a for a in filtered if a['line'].strip().upper() in selected_lines_upper]
-            
-            filtered.sort(key=lambda x: x['min'])
-            arrivals = filtered[:MAX_ARRIVALS]
-            
-        except Exception as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to fetch arrivals: {str(e)}"
-            )
+    # Get arrivals (same pipeline and cache as display_page)
+    try:
+        arrivals, station_name = await get_filtered_arrivals(config)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch arrivals: {str(e)}"
+        )
     
-    # Get weather data
-    weather_data = config.get('weather_data', {
+    # Get weather data (latest in memory, else from config)
+    weather_data = LATEST_WEATHER or config.get('weather_data', {
         'temp_c': '--',
         'temp_f': '--',
         'condition': 'N/A',
         'icon': 'cloud'
     })
     
-    # Generate image using Pillow
+    custom_note = config.get('custom_note', '')
+    
+    # Reuse a recent render if nothing visible changed (the clock is part of the key)
+    current_time = current_time_str()
+    render_key = hashlib.blake2b(
+        repr((station_name, arrivals, weather_data, custom_note, current_time)).encode(),
+        digest_size=16
+    ).hexdigest()
+    cached = RENDER_CACHE.get(render_key)
+    if cached and time.monotonic() - cached[0] < RENDER_CACHE_TTL:
+        LAST_RENDER[display_id] = (render_fingerprint(config), cached[2], cached[1])
+        return image_response(request, cached[1], cached[2])
+    
+    # Generate image using Pillow (in a worker thread so other displays' polls aren't blocked)
     try:
-        img = draw_transit_display(
-            station_name=station_name,
-            arrivals=arrivals,
-            weather_data=weather_data,
-            custom_note=config.get('custom_note', '')
+        png_bytes, etag = await asyncio.to_thread(
+            render_frame, station_name, arrivals, weather_data, custom_note
         )
         
-        # Convert to bytes (optimize=False for faster encoding on Pi)
-        img_byte_arr = BytesIO()
-        img.save(img_byte_arr, format='PNG', optimize=False)
-        img_byte_arr.seek(0)
+        # Store in render cache, evicting the oldest entry when full
+        if render_key not in RENDER_CACHE and len(RENDER_CACHE) >= RENDER_CACHE_MAX_ENTRIES:
+            RENDER_CACHE.pop(next(iter(RENDER_CACHE)))
+        RENDER_CACHE[render_key] = (time.monotonic(), png_bytes, etag)
+        LAST_RENDER[display_id] = (render_fingerprint(config), etag, png_bytes)
         
-        return StreamingResponse(
-            img_byte_arr,
-            media_type="image/png",
-            headers={
-                "Cache-Control": "no-cache, no-store, must-revalidate",
-                "Pragma": "no-cache",
-                "Expires": "0"
-            }
-        )
+        return image_response(request, png_bytes, etag)
         
     except Exception as e:
         raise HTTPException(
@@ -1596,8 +2219,6 @@ def draw_transit_display(station_name: str, arrivals: list, weather_data: dict,
     Returns a PIL Image object (800x480, white background).
     Layout: 2-column grid - Left (250px): Weather + Note | Right (550px): Transit
     """
-    global LEFT_COL_CACHE
-    
     # Create canvas - WHITE background to match HTML
     img = Image.new('RGB', (800, 480), color='white')
     draw = ImageDraw.Draw(img)
@@ -1625,92 +2246,87 @@ def draw_transit_display(station_name: str, arrivals: list, weather_data: dict,
     # ===== LEFT COLUMN (250px wide) - WITH CACHING =====
     left_col_width = 250
     
-    # Generate hash for left column data (weather + note)
+    # ----- TOP-LEFT: Weather Section (250x240) -----
     temp_c = weather_data.get('temp_c', '--')
     temp_f = weather_data.get('temp_f', '--')
     condition = weather_data.get('condition', 'N/A')
     high_c = weather_data.get('high_c', '--')
     low_c = weather_data.get('low_c', '--')
-    data_hash = f"{temp_c}|{temp_f}|{condition}|{high_c}|{low_c}|{custom_note}"
+    weather_hash = f"{temp_c}|{temp_f}|{condition}|{high_c}|{low_c}"
     
-    # Check if we can use cached left column
-    if LEFT_COL_CACHE['data_hash'] == data_hash and LEFT_COL_CACHE['image'] is not None:
-        # Use cached left column
-        img.paste(LEFT_COL_CACHE['image'], (0, 0))
-    else:
-        # Render new left column and cache it
-        left_col_img = Image.new('RGB', (left_col_width, 480), color='white')
-        left_draw = ImageDraw.Draw(left_col_img)
-        
-        # Draw horizontal border splitting left column in half
-        left_draw.line([(0, 240), (left_col_width, 240)], fill='black', width=2)
-        
-        # ----- TOP-LEFT: Weather Section (250x240) -----
+    if WEATHER_TILE_CACHE['data_hash'] != weather_hash or WEATHER_TILE_CACHE['image'] is None:
+        weather_img = Image.new('RGB', (left_col_width, 240), color='white')
+        weather_draw = ImageDraw.Draw(weather_img)
         weather_y_start = 60
         
         # Temperature (centered)
         temp_text = f"{temp_c}°C"
-        temp_bbox = left_draw.textbbox((0, 0), temp_text, font=font_xlarge)
-        temp_width = temp_bbox[2] - temp_bbox[0]
-        left_draw.text((left_col_width // 2 - temp_width // 2, weather_y_start), 
+        weather_draw.text((left_col_width // 2 - get_text_width(temp_text, 'xlarge') // 2, weather_y_start), 
                   temp_text, fill='black', font=font_xlarge)
         
         # Temperature F (centered, below)
         temp_f_text = f"({temp_f}°F)"
-        temp_f_bbox = left_draw.textbbox((0, 0), temp_f_text, font=font_small)
-        temp_f_width = temp_f_bbox[2] - temp_f_bbox[0]
-        left_draw.text((left_col_width // 2 - temp_f_width // 2, weather_y_start + 50), 
+        weather_draw.text((left_col_width // 2 - get_text_width(temp_f_text, 'small') // 2, weather_y_start + 50), 
                   temp_f_text, fill=(102, 102, 102), font=font_small)
         
         # Condition (centered)
-        cond_bbox = left_draw.textbbox((0, 0), condition, font=font_small)
-        cond_width = cond_bbox[2] - cond_bbox[0]
-        left_draw.text((left_col_width // 2 - cond_width // 2, weather_y_start + 80), 
+        weather_draw.text((left_col_width // 2 - get_text_width(condition, 'small') // 2, weather_y_start + 80), 
                   condition, fill=(102, 102, 102), font=font_small)
         
         # High/Low (centered)
         hilo_text = f"H: {high_c}° L: {low_c}°"
-        hilo_bbox = left_draw.textbbox((0, 0), hilo_text, font=font_xsmall)
-        hilo_width = hilo_bbox[2] - hilo_bbox[0]
-        left_draw.text((left_col_width // 2 - hilo_width // 2, weather_y_start + 110), 
+        weather_draw.text((left_col_width // 2 - get_text_width(hilo_text, 'xsmall') // 2, weather_y_start + 110), 
                   hilo_text, fill=(51, 51, 51), font=font_xsmall)
         
-        # ----- BOTTOM-LEFT: Custom Note Section (250x240) -----
+        WEATHER_TILE_CACHE['data_hash'] = weather_hash
+        WEATHER_TILE_CACHE['image'] = weather_img
+    
+    img.paste(WEATHER_TILE_CACHE['image'], (0, 0))
+    
+    # ----- BOTTOM-LEFT: Custom Note Section (250x240) -----
+    if NOTE_TILE_CACHE['note'] != custom_note or NOTE_TILE_CACHE['image'] is None:
+        note_img = Image.new('RGB', (left_col_width, 240), color='white')
+        note_draw = ImageDraw.Draw(note_img)
+        
         if custom_note:
             # Word wrap the note to fit in 230px width (with 10px padding on each side)
+            # Keeps a running pixel width so each word is measured once (O(words))
             note_lines = []
             words = custom_note.split()
             current_line = ""
+            current_width = 0
+            space_width = font_small.getlength(" ")
             
             for word in words:
-                test_line = current_line + " " + word if current_line else word
-                bbox = left_draw.textbbox((0, 0), test_line, font=font_small)
-                if bbox[2] - bbox[0] <= 230:  # Max width 230px
-                    current_line = test_line
+                word_width = font_small.getlength(word)
+                if current_line and current_width + space_width + word_width <= 230:  # Max width 230px
+                    current_line += " " + word
+                    current_width += space_width + word_width
                 else:
                     if current_line:
                         note_lines.append(current_line)
                     current_line = word
+                    current_width = word_width
             
             if current_line:
                 note_lines.append(current_line)
             
             # Center the text block vertically
             total_height = len(note_lines) * 22  # ~22px per line
-            note_y_start = 240 + (240 - total_height) // 2
+            note_y_start = (240 - total_height) // 2
             
             for i, line in enumerate(note_lines[:6]):  # Max 6 lines
-                bbox = left_draw.textbbox((0, 0), line, font=font_small)
-                line_width = bbox[2] - bbox[0]
-                left_draw.text((left_col_width // 2 - line_width // 2, note_y_start + i * 22), 
+                line_width = round(font_small.getlength(line))
+                note_draw.text((left_col_width // 2 - line_width // 2, note_y_start + i * 22), 
                          line, fill='black', font=font_small)
         
-        # Cache the rendered left column
-        LEFT_COL_CACHE['data_hash'] = data_hash
-        LEFT_COL_CACHE['image'] = left_col_img
-        
-        # Paste cached image onto main canvas
-        img.paste(left_col_img, (0, 0))
+        NOTE_TILE_CACHE['note'] = custom_note
+        NOTE_TILE_CACHE['image'] = note_img
+    
+    img.paste(NOTE_TILE_CACHE['image'], (0, 240))
+    
+    # Draw horizontal border splitting left column in half
+    draw.line([(0, 240), (left_col_width, 240)], fill='black', width=2)
     
     # Draw vertical border between left and right columns
     draw.line([(left_col_width, 0), (left_col_width, 480)], fill='black', width=2)
@@ -1725,15 +2341,13 @@ def draw_transit_display(station_name: str, arrivals: list, weather_data: dict,
     draw.text((right_col_x, header_y), station_name, fill='black', font=font_medium)
     
     # Current time (right)
-    current_time = datetime.now(EASTERN_TZ).strftime('%I:%M %p')
-    time_bbox = draw.textbbox((0, 0), current_time, font=font_xsmall)
-    time_width = time_bbox[2] - time_bbox[0]
+    current_time = current_time_str()
+    time_width = get_text_width(current_time, 'xsmall')
     draw.text((790 - time_width, header_y), current_time, fill='black', font=font_xsmall)
     
     # Last refresh (right, below time)
     last_refresh = f"Last: {current_time}"
-    last_bbox = draw.textbbox((0, 0), last_refresh, font=font_xsmall)
-    last_width = last_bbox[2] - last_bbox[0]
+    last_width = get_text_width(last_refresh, 'xsmall')
     draw.text((790 - last_width, header_y + 18), last_refresh, fill=(102, 102, 102), font=font_xsmall)
     
     # Header bottom border
@@ -1764,24 +2378,40 @@ def draw_transit_display(station_name: str, arrivals: list, weather_data: dict,
             
             # Minutes (23% width = ~126px, right-aligned)
             minutes = str(arrival['min'])
-            min_bbox = draw.textbbox((0, 0), minutes, font=font_large)
-            min_width = min_bbox[2] - min_bbox[0]
-            min_x = 765 - min_width
+            min_x = 765 - get_text_width(minutes, 'large')
             draw.text((min_x, y_pos - 2), minutes, fill='black', font=font_large)
     
     else:
         # No trains message
         no_trains_text = "No trains"
-        bbox = draw.textbbox((0, 0), no_trains_text, font=font_medium)
-        text_width = bbox[2] - bbox[0]
+        text_width = get_text_width(no_trains_text, 'medium')
         draw.text(((left_col_width + 800) // 2 - text_width // 2, 240), 
                  no_trains_text, fill='black', font=font_medium)
     
     return img
 
 
+# Fingerprinted asset names (e.g. app.3f9a1c2b.css) never change content, so they can be cached forever
+HASHED_ASSET_RE = re.compile(r'\.[0-9a-f]{8,}\.[A-Za-z0-9]+$')
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles with explicit Cache-Control: fingerprinted files are immutable for a year,
+    everything else may be reused for 60s before revalidating (ETag/304 from StaticFiles).
+    """
+    
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if HASHED_ASSET_RE.search(os.path.basename(full_path)):
+            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        else:
+            response.headers['Cache-Control'] = 'public, max-age=60'
+        return response
+
+
 # Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
 
 
 @app.get("/")
@@ -1800,6 +2430,7 @@ async def root():
                 "render": "/render_alt/{display_id} - Get PNG image for e-ink display",
                 "api": {
                     "arrivals": "/api/arrivals/{gtfs_id} - Get transit arrivals",
+                    "arrivals_stream": "/api/arrivals/{gtfs_id}/stream - Stream arrivals as NDJSON",
                     "stations": "/api/stations - List all stations"
                 }
             },
@@ -1811,18 +2442,25 @@ async def root():
 @app.get("/favicon.ico")
 async def favicon():
     """Return 204 No Content for favicon requests to avoid 503 errors."""
-    from fastapi import Response
     return Response(status_code=204)
 
 
 if __name__ == "__main__":
+    import importlib.util
     import uvicorn
+    
+    # uvloop (Cython event loop) + httptools (C HTTP parser) come with uvicorn[standard];
+    # uvloop has no Windows build, so fall back to the stock implementations there
+    loop_impl = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http_impl = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    
     print("\n" + "="*60)
     print("HERE Transit Display - Starting Server")
     print("="*60)
     print(f"Total stations: {len(STATION_MAPPING)}")
     print(f"Coverage: 100% (including manual overrides)")
     print(f"Server: http://localhost:8000")
+    print(f"Event loop: {loop_impl}, HTTP parser: {http_impl}")
     print("="*60 + "\n")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop=loop_impl, http=http_impl)
 
@@ -109,6 +109,9 @@ def main():
                 "main:app",
                 "--host", "0.0.0.0",
                 "--port", "8000",
+                # uvloop + httptools when installed (uvicorn[standard]); stock asyncio/h11 otherwise (e.g. Windows)
+                "--loop", "auto",
+                "--http", "auto",
                 "--reload"
             ],
             check=True